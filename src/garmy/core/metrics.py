@@ -30,8 +30,10 @@ if TYPE_CHECKING:
 from .config import Concurrency, Timeouts, get_config
 from .utils import (
     camel_to_snake_dict,
+    dataclass_field_names,
     format_date,
     handle_api_exception,
+    timestamp_field_names,
 )
 
 
@@ -98,7 +100,8 @@ class MetricDataParser:
             metric_class: The metric data class to create instances of.
             parse_func: Optional custom parsing function.
         """
-        self.metric_class = metric_class
+        # Annotated as plain ``type`` so it can key the lru_cached field lookups
+        self.metric_class: type = metric_class
         self.parse_func = parse_func or self._default_parse
 
     def parse(self, data: Any) -> Union[Any, List[Any], None]:
@@ -143,18 +146,18 @@ class MetricDataParser:
         if not isinstance(snake_dict, dict):
             raise ValueError(f"Expected dict but got {type(snake_dict)}")
 
+        # Gracefully handle unknown fields
+        known_fields = dataclass_field_names(self.metric_class)
+        filtered_kwargs = {k: v for k, v in snake_dict.items() if k in known_fields}
+
         # Handle common datetime fields
-        for field in ("timestamp", "timestamp_local"):
-            if field in snake_dict and isinstance(snake_dict[field], str):
+        for field in timestamp_field_names(self.metric_class):
+            if field in filtered_kwargs and isinstance(filtered_kwargs[field], str):
                 with contextlib.suppress(ValueError):
-                    snake_dict[field] = datetime.fromisoformat(
-                        snake_dict[field].replace("Z", "+00:00")
+                    filtered_kwargs[field] = datetime.fromisoformat(
+                        filtered_kwargs[field].replace("Z", "+00:00")
                     )
 
-        # Gracefully handle unknown fields
-        known_fields = {f.name for f in self.metric_class.__dataclass_fields__.values()}
-        filtered_kwargs = {k: v for k, v in snake_dict.items() if k in known_fields}
-
         return self.metric_class(**filtered_kwargs)
 
 
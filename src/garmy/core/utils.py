@@ -10,6 +10,8 @@ Functions:
     format_date: Format date objects for API requests.
     date_range: Generate a range of date objects.
     camel_to_snake_dict: Recursively convert dictionary keys from camelCase to snake_case.
+    dataclass_field_names: Get the (cached) set of field names of a dataclass.
+    timestamp_field_names: Get the (cached) ISO timestamp fields of a dataclass.
 
 Classes:
     TimestampMixin: Mixin providing common datetime conversion utilities.
@@ -22,11 +24,13 @@ Example:
     '2023-12-01'
 """
 
+import dataclasses
 import logging
 import re
 import threading
 from datetime import date, datetime, timedelta
-from typing import Any, Dict, List, Optional, Union
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Union
 
 
 def camel_to_snake(camel_str: str) -> str:
@@ -199,6 +203,59 @@ def camel_to_snake_dict(
     return _convert_value(data)
 
 
+@lru_cache(maxsize=None)
+def dataclass_field_names(dataclass_type: type) -> FrozenSet[str]:
+    """Get the field names of a dataclass.
+
+    Parsers filter every API response against the target dataclass fields.
+    The result is cached per class so the field set is built only once.
+
+    Args:
+        dataclass_type: Dataclass type to inspect.
+
+    Returns:
+        Frozen set of the dataclass field names.
+
+    Example:
+        >>> dataclass_field_names(Calories)
+        frozenset({'total_kilocalories', 'active_kilocalories', ...})
+    """
+    return frozenset(field.name for field in dataclasses.fields(dataclass_type))
+
+
+_TIMESTAMP_FIELDS = ("timestamp", "timestamp_local")
+
+
+@lru_cache(maxsize=None)
+def timestamp_field_names(dataclass_type: type) -> Tuple[str, ...]:
+    """Get the ISO timestamp fields that a dataclass declares.
+
+    Parsers convert these fields from ISO strings to datetimes. Resolving
+    which of them a class actually has is done once per class.
+
+    Args:
+        dataclass_type: Dataclass type to inspect.
+
+    Returns:
+        Tuple of the timestamp field names present on the dataclass.
+
+    Example:
+        >>> timestamp_field_names(TrainingReadiness)
+        ('timestamp', 'timestamp_local')
+    """
+    fields = dataclass_field_names(dataclass_type)
+    return tuple(name for name in _TIMESTAMP_FIELDS if name in fields)
+
+
+@lru_cache(maxsize=None)
+def _summary_field_name(main_class: type) -> Optional[str]:
+    """Get the first field of main_class whose name mentions 'summary', if any."""
+    for field in dataclasses.fields(main_class):
+        if "summary" in field.name.lower():
+            return field.name
+    return None
+
+
 def handle_api_exception(
     e: Exception, operation: str, endpoint: str = "", default_return: Any = None
 ) -> Any:
@@ -331,6 +388,7 @@ def create_simple_parser(
     """
     if raw_fields is None:
         raw_fields = []
+    raw_field_set = frozenset(raw_fields)
 
     def parser(data: Dict[str, Any]) -> Any:
         # Convert camelCase to snake_case at top level
@@ -347,7 +405,7 @@ def create_simple_parser(
         raw_data = {}
 
         for key, value in snake_dict.items():
-            if key in raw_fields:
+            if key in raw_field_set:
                 raw_data[key] = value
             else:
                 summary_data[key] = value
@@ -357,8 +415,7 @@ def create_simple_parser(
             # Ensure we have a dataclass
             if not hasattr(summary_class, "__dataclass_fields__"):
                 raise ValueError(f"summary_class {summary_class} is not a dataclass")
-            fields = getattr(summary_class, "__dataclass_fields__", {})
-            known_fields = {f.name for f in fields.values()}
+            known_fields = dataclass_field_names(summary_class)
             summary_kwargs = {
                 k: v for k, v in summary_data.items() if k in known_fields
             }
@@ -374,7 +431,7 @@ def create_simple_parser(
             # No summary class, just pass everything to main class
             if not hasattr(main_class, "__dataclass_fields__"):
                 raise ValueError(f"main_class {main_class} is not a dataclass")
-            known_fields = {f.name for f in main_class.__dataclass_fields__.values()}
+            known_fields = dataclass_field_names(main_class)
             # Ensure snake_dict is a dictionary before calling items()
             if not isinstance(snake_dict, dict):
                 raise ValueError(f"Expected dict but got {type(snake_dict).__name__}")
@@ -418,18 +475,13 @@ def create_simple_field_parser(dataclass_type: type) -> Any:
             )
 
         # Filter to known fields only
-        known_fields = {f.name for f in dataclass_type.__dataclass_fields__.values()}
+        known_fields = dataclass_field_names(dataclass_type)
         filtered_kwargs = {k: v for k, v in snake_dict.items() if k in known_fields}
 
-        # Handle common datetime fields
-        for field in ("timestamp", "timestamp_local", "calendar_date"):
+        # Handle common datetime fields (calendar_date stays a string)
+        for field in timestamp_field_names(dataclass_type):
             if field in filtered_kwargs and isinstance(filtered_kwargs[field], str):
                 try:
-                    from datetime import datetime
-
-                    if field == "calendar_date":
-                        # Keep calendar_date as string for now
-                        continue
                     filtered_kwargs[field] = datetime.fromisoformat(
                         filtered_kwargs[field].replace("Z", "+00:00")
                     )
@@ -463,6 +515,7 @@ def create_summary_raw_parser(
         ...     ["heart_rate_values", "heart_rate_value_descriptors"]
         ... )
     """
+    raw_field_set = frozenset(raw_fields)
 
     def parser(data: Dict[str, Any]) -> Any:
         # Convert camelCase to snake_case
@@ -475,14 +528,12 @@ def create_summary_raw_parser(
             )
 
         # Separate summary data from raw arrays
-        summary_data = {k: v for k, v in snake_dict.items() if k not in raw_fields}
+        summary_data = {k: v for k, v in snake_dict.items() if k not in raw_field_set}
 
         # Create summary object with field filtering
         if not hasattr(summary_class, "__dataclass_fields__"):
             raise ValueError(f"summary_class {summary_class} is not a dataclass")
-        summary_known_fields = {
-            f.name for f in summary_class.__dataclass_fields__.values()
-        }
+        summary_known_fields = dataclass_field_names(summary_class)
         summary_kwargs = {
             k: v for k, v in summary_data.items() if k in summary_known_fields
         }
@@ -491,12 +542,8 @@ def create_summary_raw_parser(
         # Determine summary field name in main class
         if not hasattr(main_class, "__dataclass_fields__"):
             raise ValueError(f"main_class {main_class} is not a dataclass")
-        main_fields = {f.name for f in main_class.__dataclass_fields__.values()}
-        summary_field_name = None
-        for field_name in main_fields:
-            if "summary" in field_name.lower():
-                summary_field_name = field_name
-                break
+        main_fields = dataclass_field_names(main_class)
+        summary_field_name = _summary_field_name(main_class)
 
         if summary_field_name:
             # Create main object with summary and raw data
@@ -517,15 +564,17 @@ def create_summary_raw_parser(
 
             # Add any remaining fields that belong to main class
             for k, v in snake_dict.items():
-                if k in main_fields and k != summary_field_name and k not in raw_fields:
+                if (
+                    k in main_fields
+                    and k != summary_field_name
+                    and k not in raw_field_set
+                ):
                     main_kwargs[k] = v
 
             return main_class(**main_kwargs)
         else:
             # Fallback: try to pass everything to main class
-            main_known_fields = {
-                f.name for f in main_class.__dataclass_fields__.values()
-            }
+            main_known_fields = dataclass_field_names(main_class)
             main_kwargs = {
                 k: v for k, v in snake_dict.items() if k in main_known_fields
             }
@@ -595,6 +644,7 @@ def create_nested_summary_parser(
     """
     if raw_fields is None:
         raw_fields = []
+    raw_field_set = frozenset(raw_fields)
 
     def parser(data: Dict[str, Any]) -> Any:
         # Convert camelCase to snake_case
@@ -612,9 +662,7 @@ def create_nested_summary_parser(
         # Create summary object with field filtering
         if not hasattr(summary_class, "__dataclass_fields__"):
             raise ValueError(f"summary_class {summary_class} is not a dataclass")
-        summary_known_fields = {
-            f.name for f in summary_class.__dataclass_fields__.values()
-        }
+        summary_known_fields = dataclass_field_names(summary_class)
         summary_kwargs = {
             k: v for k, v in nested_data.items() if k in summary_known_fields
         }
@@ -623,12 +671,8 @@ def create_nested_summary_parser(
         # Determine summary field name in main class
         if not hasattr(main_class, "__dataclass_fields__"):
             raise ValueError(f"main_class {main_class} is not a dataclass")
-        main_fields = {f.name for f in main_class.__dataclass_fields__.values()}
-        summary_field_name = None
-        for field_name in main_fields:
-            if "summary" in field_name.lower():
-                summary_field_name = field_name
-                break
+        main_fields = dataclass_field_names(main_class)
+        summary_field_name = _summary_field_name(main_class)
 
         if summary_field_name:
             # Create main object with summary and raw data
@@ -641,15 +685,13 @@ def create_nested_summary_parser(
 
             # Add any remaining top-level fields that belong to main class
             for k, v in snake_dict.items():
-                if k in main_fields and k != nested_key and k not in raw_fields:
+                if k in main_fields and k != nested_key and k not in raw_field_set:
                     main_kwargs[k] = v
 
             return main_class(**main_kwargs)
         else:
             # Fallback: try to pass everything to main class
-            main_known_fields = {
-                f.name for f in main_class.__dataclass_fields__.values()
-            }
+            main_known_fields = dataclass_field_names(main_class)
             main_kwargs = {
                 k: v for k, v in snake_dict.items() if k in main_known_fields
             }
@@ -1,8 +1,17 @@
 """Activity pagination and iteration utilities."""
 
-from datetime import date
+from datetime import date, datetime
 from typing import Any, List, Optional
-import asyncio
+
+
+_START_TIME_ATTRS = ('start_time_local', 'startTimeLocal', 'start_time', 'activityDate')
+
+
+def _parse_iso_datetime(value: str) -> datetime:
+    """Parse an ISO 8601 string, accepting a trailing 'Z' for UTC."""
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value)
 
 
 class ActivitiesIterator:
@@ -89,7 +98,7 @@ class ActivitiesIterator:
         start_time = None
         
         # Try different attribute names for start time
-        for attr in ['start_time_local', 'startTimeLocal', 'start_time', 'activityDate']:
+        for attr in _START_TIME_ATTRS:
             if hasattr(activity, attr):
                 start_time = getattr(activity, attr)
                 break
@@ -98,13 +107,7 @@ class ActivitiesIterator:
             try:
                 # Handle ISO string format
                 if isinstance(start_time, str):
-                    from datetime import datetime
-                    start_time = start_time.replace('Z', '+00:00')
-                    if '.' in start_time and '+' in start_time:
-                        dt = datetime.fromisoformat(start_time)
-                    else:
-                        dt = datetime.fromisoformat(start_time)
-                    return dt.date()
+                    return _parse_iso_datetime(start_time).date()
                 elif hasattr(start_time, 'date'):
                     return start_time.date()
             except Exception:
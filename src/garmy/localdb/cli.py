@@ -137,13 +137,9 @@ def cmd_status(args) -> int:
             from .models import SyncStatus
             
             # Count by status
-            status_counts = {}
             from sqlalchemy import func
-            all_statuses = session.query(SyncStatus.status, 
-                                       func.count(SyncStatus.status)).group_by(SyncStatus.status).all()
-            
-            for status, count in all_statuses:
-                status_counts[status] = count
+            status_counts = dict(session.query(SyncStatus.status,
+                                               func.count(SyncStatus.status)).group_by(SyncStatus.status))
             
             print("=== SYNC STATUS OVERVIEW ===")
             for status in ['completed', 'pending', 'failed', 'skipped']:
@@ -186,15 +182,15 @@ def cmd_reset(args) -> int:
         with db.get_session() as session:
             from .models import SyncStatus
             
-            # Count failed records
-            failed_count = session.query(SyncStatus).filter(SyncStatus.status == 'failed').count()
-            
-            if failed_count == 0:
-                print("No failed records found")
-                return 0
-            
-            # Confirm reset
+            # Count failed records for the confirmation prompt; with --force
+            # the UPDATE's row count is enough
             if not args.force:
+                failed_count = session.query(SyncStatus).filter(SyncStatus.status == 'failed').count()
+                
+                if failed_count == 0:
+                    print("No failed records found")
+                    return 0
+                
                 response = input(f"Reset {failed_count} failed records to pending? (y/N): ")
                 if response.lower() != 'y':
                     print("Reset cancelled")
@@ -207,6 +203,10 @@ def cmd_reset(args) -> int:
                 'synced_at': None
             })
             
+            if updated == 0:
+                print("No failed records found")
+                return 0
+            
             session.commit()
             print(f"Reset {updated} failed records to pending")
         
@@ -39,6 +39,10 @@ class DatabaseConfig:
     timeout: float = 30.0
     enable_wal_mode: bool = True
     
+    # Performance settings
+    cache_size_kb: int = 64 * 1024  # Page cache per connection
+    mmap_size: int = 256 * 1024 * 1024  # Bytes of the database to memory-map (0 disables)
+    
     # Timestamp conversion
     ms_per_second: int = 1000
     seconds_per_day: int = 24 * 60 * 60
@@ -1,20 +1,64 @@
 """SQLAlchemy database for health metrics storage."""
 
-from datetime import date
+import json
+from datetime import date, datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional, TYPE_CHECKING
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Set, Tuple, TYPE_CHECKING
 
-from sqlalchemy import create_engine, and_
+from sqlalchemy import Index, Table, create_engine, and_, event, exists, func, select, text, update
+from sqlalchemy.dialects.sqlite import Insert, insert as sqlite_insert
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool
 
 from .models import Base, TimeSeries, Activity, DailyHealthMetric, SyncStatus, MetricType
 
+try:
+    import orjson
+    _HAVE_ORJSON = True
+except ImportError:
+    _HAVE_ORJSON = False
+
 if TYPE_CHECKING:
     from .config import DatabaseConfig
 else:
     DatabaseConfig = None
 
 
+if _HAVE_ORJSON:
+    def _json_serializer(value: Any) -> str:
+        """Encode JSON column values with orjson."""
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    def _json_deserializer(value: str) -> Any:
+        """Decode JSON column values with orjson."""
+        return orjson.loads(value)
+else:
+    def _json_serializer(value: Any) -> str:
+        """Encode JSON column values with the json module."""
+        return json.dumps(value)
+    
+    def _json_deserializer(value: str) -> Any:
+        """Decode JSON column values with the json module."""
+        return json.loads(value)
+
+
+# Truncate the WAL back to this size after checkpoints instead of letting it keep its peak size
+_WAL_SIZE_LIMIT = 64 * 1024 * 1024
+
+
+def _enable_wal(dbapi_connection: Any, connection_record: Any) -> None:
+    """Use write-ahead logging so commits append to the WAL instead of syncing the database."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    # Some filesystems cannot host a WAL; relaxed syncing is only safe once it is active
+    if cursor.fetchone()[0].lower() == "wal":
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA journal_size_limit={_WAL_SIZE_LIMIT}")
+    cursor.close()
+
+
 def _get_default_config() -> 'DatabaseConfig':
     """Get default database configuration."""
     if DatabaseConfig is None:
@@ -23,6 +67,98 @@ def _get_default_config() -> 'DatabaseConfig':
     return DatabaseConfig()
 
 
+_HEALTH_METRIC_COLUMNS = tuple(column.name for column in DailyHealthMetric.__table__.columns)
+_ACTIVITY_COLUMNS = tuple(column.name for column in Activity.__table__.columns)
+
+_HEALTH_METRIC_KEYS = ('user_id', 'metric_date')
+_HEALTH_METRIC_FIELDS = frozenset(
+    column.name for column in DailyHealthMetric.__table__.columns
+    if column.name not in _HEALTH_METRIC_KEYS + ('created_at', 'updated_at')
+)
+
+
+@lru_cache(maxsize=None)
+def _health_metric_upsert(columns: Tuple[str, ...]) -> Insert:
+    """Build an upsert for daily health metrics that only overwrites the given columns.
+    
+    Statements are cached per column set, so callers should pass the columns sorted.
+    """
+    stmt = sqlite_insert(DailyHealthMetric.__table__)
+    update_columns = {name: stmt.excluded[name] for name in columns if name not in _HEALTH_METRIC_KEYS}
+    # The column's Python default fills updated_at for every inserted row
+    update_columns['updated_at'] = stmt.excluded.updated_at
+    return stmt.on_conflict_do_update(index_elements=list(_HEALTH_METRIC_KEYS), set_=update_columns)
+
+
+def _timeseries_upsert() -> Insert:
+    """Build an upsert for timeseries points that replaces value and metadata."""
+    stmt = sqlite_insert(TimeSeries.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=['user_id', 'metric_type', 'timestamp'],
+        set_={'value': stmt.excluded.value, 'meta_data': stmt.excluded.meta_data}
+    )
+
+
+def _activity_upsert() -> Insert:
+    """Build an upsert for activities that refreshes everything but created_at."""
+    stmt = sqlite_insert(Activity.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=['user_id', 'activity_id'],
+        set_={
+            name: stmt.excluded[name] for name in _ACTIVITY_COLUMNS
+            if name not in ('user_id', 'activity_id', 'created_at')
+        }
+    )
+
+
+def _activity_params(user_id: int, activity_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Map extracted activity data onto activities table parameters."""
+    return {
+        'user_id': user_id,
+        'activity_id': activity_data['activity_id'],
+        'activity_date': activity_data['activity_date'],
+        'activity_name': activity_data.get('activity_name'),
+        'duration_seconds': activity_data.get('duration_seconds'),
+        'avg_heart_rate': activity_data.get('avg_heart_rate'),
+        'training_load': activity_data.get('training_load'),
+        'start_time': activity_data.get('start_time')
+    }
+
+
+_TIMESERIES_UPSERT = _timeseries_upsert()
+_ACTIVITY_UPSERT = _activity_upsert()
+_SYNC_STATUS_INSERT_IGNORE = sqlite_insert(SyncStatus.__table__).on_conflict_do_nothing(
+    index_elements=['user_id', 'sync_date', 'metric_type']
+)
+
+
+def _sync_status_upsert() -> Insert:
+    """Build an upsert for sync statuses that only overwrites the status."""
+    stmt = sqlite_insert(SyncStatus.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=['user_id', 'sync_date', 'metric_type'],
+        set_={'status': stmt.excluded.status}
+    )
+
+
+_SYNC_STATUS_UPSERT = _sync_status_upsert()
+
+
+def _missing_schema(conn: Connection) -> Tuple[List[Table], List[Index]]:
+    """Find the tables and indexes of the models that the database lacks."""
+    existing = set(conn.scalars(text(
+        "SELECT name FROM sqlite_master WHERE type IN ('table', 'index')"
+    )))
+    missing_tables = [table for table in Base.metadata.sorted_tables
+                      if table.name not in existing]
+    # create_all only builds indexes together with their table, so
+    # indexes added after a database was first created go in here.
+    missing_indexes = [index for table in Base.metadata.sorted_tables
+                       if table.name in existing
+                       for index in table.indexes if index.name not in existing]
+    return missing_tables, missing_indexes
+
+
 class HealthDB:
     """SQLAlchemy database for health metrics."""
     
@@ -38,10 +174,55 @@ class HealthDB:
         self.db_path = db_path
         self.config = config if config is not None else _get_default_config()
         
-        self.engine = create_engine(f"sqlite:///{db_path}")
+        in_memory = str(db_path) == ":memory:"
+        # Wait on SQLite's busy handler when another writer holds the lock
+        connect_args: Dict[str, Any] = {'timeout': self.config.timeout}
+        engine_options: Dict[str, Any] = {}
+        if not in_memory:
+            # Keep file connections open between sessions so the PRAGMA setup
+            # below runs once per connection. SQLAlchemy 2.x does this by
+            # default; 1.4 would use NullPool and reconnect for every session.
+            engine_options['poolclass'] = QueuePool
+            connect_args['check_same_thread'] = False
+        
+        self.engine = create_engine(
+            f"sqlite:///{db_path}",
+            connect_args=connect_args,
+            json_serializer=_json_serializer,
+            json_deserializer=_json_deserializer,
+            **engine_options
+        )
+        event.listen(self.engine, "connect", self._configure_connection)
+        # In-memory databases have no journal file to switch to WAL
+        if self.config.enable_wal_mode and not in_memory:
+            event.listen(self.engine, "connect", _enable_wal)
         self.SessionLocal = sessionmaker(bind=self.engine)
         
-        Base.metadata.create_all(self.engine)
+        self._create_schema()
+    
+    def _configure_connection(self, dbapi_connection: Any, connection_record: Any) -> None:
+        """Apply page cache, temp storage and memory-map settings to a new connection."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute(f"PRAGMA cache_size=-{int(self.config.cache_size_kb)}")
+        cursor.execute(f"PRAGMA mmap_size={int(self.config.mmap_size)}")
+        cursor.close()
+    
+    def _create_schema(self):
+        """Create missing tables and indexes, reading the catalog once when none are missing."""
+        with self.engine.begin() as conn:
+            missing_tables, missing_indexes = _missing_schema(conn)
+            if not missing_tables and not missing_indexes:
+                return
+            # pysqlite runs DDL in autocommit mode; wrap it in one transaction
+            # so bootstrapping commits once instead of once per statement.
+            # IMMEDIATE takes the write lock first, and the catalog is read
+            # again under it in case another process created the schema meanwhile.
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+            missing_tables, missing_indexes = _missing_schema(conn)
+            Base.metadata.create_all(conn, tables=missing_tables, checkfirst=False)
+            for index in missing_indexes:
+                index.create(conn)
     
     def get_session(self) -> Session:
         """Get database session."""
@@ -64,89 +245,98 @@ class HealthDB:
             return False
     
     def store_timeseries_batch(self, user_id: int, metric_type: MetricType, data: List[tuple]):
-        """Store batch of timeseries data."""
+        """Store batch of timeseries data.
+        
+        Points with empty metadata are stored with a NULL meta_data column;
+        the timeseries readers return them with an empty dict.
+        """
+        params = [{
+            'user_id': user_id,
+            'metric_type': metric_type.value,
+            'timestamp': timestamp,
+            'value': value,
+            'meta_data': metadata or None
+        } for timestamp, value, metadata in data]
+        if not params:
+            return
+        
         with self.get_session() as session:
-            for timestamp, value, metadata in data:
-                timeseries = TimeSeries(
-                    user_id=user_id,
-                    metric_type=metric_type.value,
-                    timestamp=timestamp,
-                    value=value,
-                    meta_data=metadata
-                )
-                session.merge(timeseries)
+            session.execute(_TIMESERIES_UPSERT, params)
             session.commit()
     
     def store_activity(self, user_id: int, activity_data: Dict[str, Any]):
         """Store activity data."""
+        self.store_activities(user_id, [activity_data])
+    
+    def store_activities(self, user_id: int, activities: List[Dict[str, Any]]):
+        """Store many activities in a single transaction."""
+        params = [_activity_params(user_id, activity_data) for activity_data in activities]
+        if not params:
+            return
+        
         with self.get_session() as session:
-            activity = Activity(
-                user_id=user_id,
-                activity_id=activity_data['activity_id'],
-                activity_date=activity_data['activity_date'],
-                activity_name=activity_data.get('activity_name'),
-                duration_seconds=activity_data.get('duration_seconds'),
-                avg_heart_rate=activity_data.get('avg_heart_rate'),
-                training_load=activity_data.get('training_load'),
-                start_time=activity_data.get('start_time')
-            )
-            session.merge(activity)
+            session.execute(_ACTIVITY_UPSERT, params)
             session.commit()
     
     def store_health_metric(self, user_id: int, metric_date: date, **kwargs):
-        """Store daily health metric data."""
+        """Store daily health metric data.
+        
+        Only the given columns are written; other columns of an existing
+        row keep their stored values. Unknown names are ignored.
+        """
+        self.store_health_metrics_batch(user_id, [dict(kwargs, metric_date=metric_date)])
+    
+    def store_health_metrics_batch(self, user_id: int, rows: List[Dict[str, Any]]):
+        """Store daily health metrics for many dates in a single transaction.
+        
+        Args:
+            user_id: User identifier.
+            rows: Dicts holding a ``metric_date`` plus the health metric columns to set.
+                Columns missing from a row keep their stored values.
+        """
+        # executemany needs a uniform parameter set, so group rows by the columns they carry
+        batches: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for row in rows:
+            values = {field: value for field, value in row.items() if field in _HEALTH_METRIC_FIELDS}
+            values['user_id'] = user_id
+            values['metric_date'] = row['metric_date']
+            batches.setdefault(tuple(sorted(values)), []).append(values)
+        
         with self.get_session() as session:
-            # Get existing record or create new one
-            metric = session.query(DailyHealthMetric).filter(
-                and_(
-                    DailyHealthMetric.user_id == user_id,
-                    DailyHealthMetric.metric_date == metric_date
-                )
-            ).first()
-            
-            if metric is None:
-                metric = DailyHealthMetric(user_id=user_id, metric_date=metric_date)
-            
-            # Update fields from kwargs
-            for field, value in kwargs.items():
-                if hasattr(metric, field):
-                    setattr(metric, field, value)
-            
-            session.merge(metric)
+            for columns, params in batches.items():
+                session.execute(_health_metric_upsert(columns), params)
             session.commit()
     
     
     def create_sync_status(self, user_id: int, sync_date: date, metric_type: MetricType, status: str = 'pending'):
         """Create sync status record."""
         with self.get_session() as session:
-            sync_status = SyncStatus(
-                user_id=user_id,
-                sync_date=sync_date,
-                metric_type=metric_type.value,
-                status=status
-            )
-            session.merge(sync_status)
+            session.execute(_SYNC_STATUS_UPSERT, {
+                'user_id': user_id,
+                'sync_date': sync_date,
+                'metric_type': metric_type.value,
+                'status': status
+            })
             session.commit()
     
     def update_sync_status(self, user_id: int, sync_date: date, metric_type: MetricType, 
                           status: str, error_message: Optional[str] = None):
         """Update sync status record."""
+        values = {'status': status, 'synced_at': datetime.utcnow()}
+        if error_message:
+            values['error_message'] = error_message
+        
         with self.get_session() as session:
-            from datetime import datetime
-            sync_status = session.query(SyncStatus).filter(
-                and_(
-                    SyncStatus.user_id == user_id,
-                    SyncStatus.sync_date == sync_date,
-                    SyncStatus.metric_type == metric_type.value
-                )
-            ).first()
-            
-            if sync_status:
-                sync_status.status = status
-                sync_status.synced_at = datetime.utcnow()
-                if error_message:
-                    sync_status.error_message = error_message
-                session.commit()
+            session.execute(
+                update(SyncStatus).where(
+                    and_(
+                        SyncStatus.user_id == user_id,
+                        SyncStatus.sync_date == sync_date,
+                        SyncStatus.metric_type == metric_type.value
+                    )
+                ).values(values)
+            )
+            session.commit()
     
     def get_sync_status(self, user_id: int, sync_date: date, metric_type: MetricType) -> Optional[str]:
         """Get sync status for specific metric."""
@@ -163,66 +353,129 @@ class HealthDB:
     def get_pending_metrics(self, user_id: int, sync_date: date) -> List[str]:
         """Get list of pending metrics for date."""
         with self.get_session() as session:
-            pending_statuses = session.query(SyncStatus).filter(
-                and_(
-                    SyncStatus.user_id == user_id,
-                    SyncStatus.sync_date == sync_date,
-                    SyncStatus.status == 'pending'
+            rows = session.execute(
+                select(SyncStatus.metric_type).where(
+                    and_(
+                        SyncStatus.user_id == user_id,
+                        SyncStatus.sync_date == sync_date,
+                        SyncStatus.status == 'pending'
+                    )
                 )
-            ).all()
-            return [status.metric_type for status in pending_statuses]
+            )
+            return [metric_type for metric_type, in rows]
+    
+    def get_sync_statuses(self, user_id: int, start_date: date,
+                          end_date: date) -> Dict[Tuple[date, str], str]:
+        """Get sync statuses for date range keyed by (sync_date, metric_type value).
+        
+        Lets sync loops answer per-task status checks from memory instead of
+        issuing one query per date and metric.
+        """
+        with self.get_session() as session:
+            rows = session.execute(
+                select(SyncStatus.sync_date, SyncStatus.metric_type, SyncStatus.status).where(
+                    and_(
+                        SyncStatus.user_id == user_id,
+                        SyncStatus.sync_date >= start_date,
+                        SyncStatus.sync_date <= end_date
+                    )
+                )
+            )
+            return {(sync_date, metric_type): status for sync_date, metric_type, status in rows}
+    
+    def create_pending_sync_statuses(self, user_id: int, tasks: List[Tuple[date, MetricType]]):
+        """Create 'pending' sync status records in one statement, keeping existing ones."""
+        params = [
+            {'user_id': user_id, 'sync_date': sync_date, 'metric_type': metric_type.value,
+             'status': 'pending'}
+            for sync_date, metric_type in tasks
+        ]
+        if not params:
+            return
+        
+        with self.get_session() as session:
+            session.execute(_SYNC_STATUS_INSERT_IGNORE, params)
+            session.commit()
     
     def sync_status_exists(self, user_id: int, sync_date: date, metric_type: MetricType) -> bool:
         """Check if sync status record exists."""
         with self.get_session() as session:
-            return session.query(SyncStatus).filter(
+            return bool(session.scalar(select(exists().where(
                 and_(
                     SyncStatus.user_id == user_id,
                     SyncStatus.sync_date == sync_date,
                     SyncStatus.metric_type == metric_type.value
                 )
-            ).first() is not None
+            ))))
     
     
     def activity_exists(self, user_id: int, activity_id: str) -> bool:
         """Check if activity exists."""
         with self.get_session() as session:
-            return session.query(Activity).filter(
+            return bool(session.scalar(select(exists().where(
                 and_(
                     Activity.user_id == user_id,
                     Activity.activity_id == activity_id
                 )
-            ).first() is not None
+            ))))
+    
+    def get_existing_activity_ids(self, user_id: int, activity_ids: Iterable[str]) -> Set[str]:
+        """Get which of the given activity IDs are already stored for user.
+        
+        Lets sync loops check a batch of activities with one query instead
+        of issuing one query per activity.
+        """
+        activity_ids = [str(activity_id) for activity_id in activity_ids]
+        if not activity_ids:
+            return set()
+        
+        with self.get_session() as session:
+            rows = session.execute(
+                select(Activity.activity_id).where(
+                    and_(
+                        Activity.user_id == user_id,
+                        Activity.activity_id.in_(activity_ids)
+                    )
+                )
+            )
+            return {activity_id for activity_id, in rows}
     
     def health_metric_exists(self, user_id: int, metric_date: date) -> bool:
         """Check if health metric exists for date."""
         with self.get_session() as session:
-            return session.query(DailyHealthMetric).filter(
+            return bool(session.scalar(select(exists().where(
                 and_(
                     DailyHealthMetric.user_id == user_id,
                     DailyHealthMetric.metric_date == metric_date
                 )
-            ).first() is not None
+            ))))
     
     
     def get_health_metrics(self, user_id: int, start_date: date, end_date: date) -> List[Dict[str, Any]]:
         """Query health metrics for date range."""
+        return list(self.iter_health_metrics(user_id, start_date, end_date))
+    
+    def iter_health_metrics(self, user_id: int, start_date: date, end_date: date) -> Iterator[Dict[str, Any]]:
+        """Stream health metrics for date range one row at a time."""
         with self.get_session() as session:
-            metrics = session.query(DailyHealthMetric).filter(
-                and_(
-                    DailyHealthMetric.user_id == user_id,
-                    DailyHealthMetric.metric_date >= start_date,
-                    DailyHealthMetric.metric_date <= end_date
-                )
-            ).order_by(DailyHealthMetric.metric_date).all()
+            rows = session.execute(
+                select(*DailyHealthMetric.__table__.columns).where(
+                    and_(
+                        DailyHealthMetric.user_id == user_id,
+                        DailyHealthMetric.metric_date >= start_date,
+                        DailyHealthMetric.metric_date <= end_date
+                    )
+                ).order_by(DailyHealthMetric.metric_date)
+            )
             
-            return [self._metric_to_dict(metric) for metric in metrics]
+            for row in rows:
+                yield dict(zip(_HEALTH_METRIC_COLUMNS, row))
     
     def get_activities(self, user_id: int, start_date: date, end_date: date, 
                       activity_name: Optional[str] = None) -> List[Dict[str, Any]]:
         """Query activities for date range."""
         with self.get_session() as session:
-            query = session.query(Activity).filter(
+            query = select(*Activity.__table__.columns).where(
                 and_(
                     Activity.user_id == user_id,
                     Activity.activity_date >= start_date,
@@ -231,81 +484,58 @@ class HealthDB:
             )
             
             if activity_name:
-                query = query.filter(Activity.activity_name == activity_name)
+                query = query.where(Activity.activity_name == activity_name)
             
-            activities = query.order_by(Activity.activity_date).all()
-            return [self._activity_to_dict(activity) for activity in activities]
+            rows = session.execute(query.order_by(Activity.activity_date))
+            return [dict(zip(_ACTIVITY_COLUMNS, row)) for row in rows]
     
     def get_timeseries(self, user_id: int, metric_type: MetricType,
                       start_timestamp: int, end_timestamp: int) -> List[tuple]:
         """Query timeseries data for time range."""
+        return list(self.iter_timeseries(user_id, metric_type, start_timestamp, end_timestamp))
+    
+    def aggregate_timeseries(self, user_id: int, metric_type: MetricType,
+                             start_timestamp: int, end_timestamp: int) -> Dict[str, Any]:
+        """Summarize timeseries values for time range in SQL.
+        
+        Returns count, min, max and avg of the values without loading the
+        individual points; the value statistics are None when there are none.
+        """
         with self.get_session() as session:
-            timeseries = session.query(TimeSeries).filter(
-                and_(
-                    TimeSeries.user_id == user_id,
-                    TimeSeries.metric_type == metric_type.value,
-                    TimeSeries.timestamp >= start_timestamp,
-                    TimeSeries.timestamp <= end_timestamp
+            row = session.execute(
+                select(
+                    func.count(TimeSeries.value),
+                    func.min(TimeSeries.value),
+                    func.max(TimeSeries.value),
+                    func.avg(TimeSeries.value)
+                ).where(
+                    and_(
+                        TimeSeries.user_id == user_id,
+                        TimeSeries.metric_type == metric_type.value,
+                        TimeSeries.timestamp >= start_timestamp,
+                        TimeSeries.timestamp <= end_timestamp
+                    )
                 )
-            ).order_by(TimeSeries.timestamp).all()
-            
-            return [(ts.timestamp, ts.value, ts.meta_data) for ts in timeseries]
-    
-    
-    def _metric_to_dict(self, metric: DailyHealthMetric) -> Dict[str, Any]:
-        """Convert DailyHealthMetric to dictionary."""
-        return {
-            'user_id': metric.user_id,
-            'metric_date': metric.metric_date,
-            'total_steps': metric.total_steps,
-            'step_goal': metric.step_goal,
-            'total_distance_meters': metric.total_distance_meters,
-            'total_calories': metric.total_calories,
-            'active_calories': metric.active_calories,
-            'bmr_calories': metric.bmr_calories,
-            'resting_heart_rate': metric.resting_heart_rate,
-            'max_heart_rate': metric.max_heart_rate,
-            'min_heart_rate': metric.min_heart_rate,
-            'average_heart_rate': metric.average_heart_rate,
-            'avg_stress_level': metric.avg_stress_level,
-            'max_stress_level': metric.max_stress_level,
-            'body_battery_high': metric.body_battery_high,
-            'body_battery_low': metric.body_battery_low,
-            'sleep_duration_hours': metric.sleep_duration_hours,
-            'deep_sleep_hours': metric.deep_sleep_hours,
-            'light_sleep_hours': metric.light_sleep_hours,
-            'rem_sleep_hours': metric.rem_sleep_hours,
-            'awake_hours': metric.awake_hours,
-            'deep_sleep_percentage': metric.deep_sleep_percentage,
-            'light_sleep_percentage': metric.light_sleep_percentage,
-            'rem_sleep_percentage': metric.rem_sleep_percentage,
-            'awake_percentage': metric.awake_percentage,
-            'average_spo2': metric.average_spo2,
-            'average_respiration': metric.average_respiration,
-            'training_readiness_score': metric.training_readiness_score,
-            'training_readiness_level': metric.training_readiness_level,
-            'training_readiness_feedback': metric.training_readiness_feedback,
-            'hrv_weekly_avg': metric.hrv_weekly_avg,
-            'hrv_last_night_avg': metric.hrv_last_night_avg,
-            'hrv_status': metric.hrv_status,
-            'avg_waking_respiration_value': metric.avg_waking_respiration_value,
-            'avg_sleep_respiration_value': metric.avg_sleep_respiration_value,
-            'lowest_respiration_value': metric.lowest_respiration_value,
-            'highest_respiration_value': metric.highest_respiration_value,
-            'created_at': metric.created_at,
-            'updated_at': metric.updated_at
-        }
+            ).one()
+            return dict(zip(('count', 'min', 'max', 'avg'), row))
     
-    def _activity_to_dict(self, activity: Activity) -> Dict[str, Any]:
-        """Convert Activity to dictionary."""
-        return {
-            'user_id': activity.user_id,
-            'activity_id': activity.activity_id,
-            'activity_date': activity.activity_date,
-            'activity_name': activity.activity_name,
-            'duration_seconds': activity.duration_seconds,
-            'avg_heart_rate': activity.avg_heart_rate,
-            'training_load': activity.training_load,
-            'start_time': activity.start_time,
-            'created_at': activity.created_at
-        }
\ No newline at end of file
+    def iter_timeseries(self, user_id: int, metric_type: MetricType,
+                       start_timestamp: int, end_timestamp: int) -> Iterator[tuple]:
+        """Stream timeseries data for time range one point at a time.
+        
+        Points stored without metadata come back with an empty dict.
+        """
+        with self.get_session() as session:
+            rows = session.execute(
+                select(TimeSeries.timestamp, TimeSeries.value, TimeSeries.meta_data).where(
+                    and_(
+                        TimeSeries.user_id == user_id,
+                        TimeSeries.metric_type == metric_type.value,
+                        TimeSeries.timestamp >= start_timestamp,
+                        TimeSeries.timestamp <= end_timestamp
+                    )
+                ).order_by(TimeSeries.timestamp)
+            )
+            
+            for timestamp, value, meta_data in rows:
+                yield (timestamp, value, meta_data if meta_data is not None else {})
@@ -1,89 +1,213 @@
 """Data extraction utilities for converting API responses to database format."""
 
-from datetime import date
-from typing import Any, Dict, List, Optional, Tuple
+from operator import attrgetter
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple
 from .models import MetricType
 
 
+def _attr_reader(fields: Tuple[Tuple[str, str], ...]) -> Callable[[Any], Dict[str, Any]]:
+    """Build a reader mapping source attributes to output keys.
+    
+    All attributes are fetched in one attrgetter call; objects missing any of
+    them fall back to per-attribute getattr with a None default.
+    """
+    keys = tuple(key for key, _ in fields)
+    sources = tuple(source for _, source in fields)
+    getter = attrgetter(*sources)
+    single = len(sources) == 1
+    
+    def read(obj: Any) -> Dict[str, Any]:
+        try:
+            values = getter(obj)
+            if single:
+                values = (values,)
+        except AttributeError:
+            values = tuple(getattr(obj, source, None) for source in sources)
+        return dict(zip(keys, values))
+    
+    return read
+
+
+def _read_nested(data: Any, container: str,
+                 read: Callable[[Any], Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Apply a reader to a nested summary object, or return None if it is absent."""
+    nested = getattr(data, container, None)
+    return read(nested) if nested else None
+
+
+_read_daily_summary = _attr_reader((
+    # Steps and movement
+    ('total_steps', 'total_steps'),
+    ('step_goal', 'daily_step_goal'),
+    ('total_distance_meters', 'total_distance_meters'),
+    # Calories
+    ('total_calories', 'total_kilocalories'),
+    ('active_calories', 'active_kilocalories'),
+    ('bmr_calories', 'bmr_kilocalories'),
+    # Heart rate
+    ('resting_heart_rate', 'resting_heart_rate'),
+    ('max_heart_rate', 'max_heart_rate'),
+    ('min_heart_rate', 'min_heart_rate'),
+    ('average_heart_rate', 'average_heart_rate'),
+    # Stress and recovery
+    ('avg_stress_level', 'avg_stress_level'),
+    ('max_stress_level', 'max_stress_level'),
+    ('body_battery_high', 'body_battery_highest_value'),
+    ('body_battery_low', 'body_battery_lowest_value'),
+    # Additional metrics that might be in daily summary
+    ('average_spo2', 'average_sp_o2_value'),
+    ('average_respiration', 'average_respiration_value'),
+))
+
+_read_sleep_percentages = _attr_reader((
+    ('sleep_duration_hours', 'sleep_duration_hours'),
+    ('deep_sleep_percentage', 'deep_sleep_percentage'),
+    ('light_sleep_percentage', 'light_sleep_percentage'),
+    ('rem_sleep_percentage', 'rem_sleep_percentage'),
+    ('awake_percentage', 'awake_percentage'),
+))
+
+# Activity fields and the attribute/key names they appear under in parsed
+# objects and raw API dicts, in order of preference
+_ACTIVITY_ID_ALIASES = ('activity_id', 'activityId')
+_ACTIVITY_FIELDS = (
+    ('activity_name', ('activity_name', 'activityName', 'activityTypeName')),
+    ('duration_seconds', ('duration', 'movingDuration', 'elapsedDuration')),
+    ('avg_heart_rate', ('average_hr', 'averageHR', 'avgHR')),
+    ('training_load', ('activity_training_load', 'trainingLoad')),
+    ('start_time', ('start_time_local', 'startTimeLocal', 'start_time')),
+)
+
+_MISSING = object()
+
+
+def _first_present(data: Any, aliases: Tuple[str, ...]) -> Any:
+    """Return the first alias present on data (dict key or attribute), else None."""
+    if isinstance(data, dict):
+        for key in aliases:
+            value = data.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+    else:
+        for key in aliases:
+            value = getattr(data, key, _MISSING)
+            if value is not _MISSING:
+                return value
+    return None
+
+
+# Shared metadata for timeseries points that carry none. Never mutate it:
+# the same object is referenced by every such point. (A plain dict rather
+# than a MappingProxyType so it stays JSON-serialisable.)
+_EMPTY_META: Dict[str, Any] = {}
+
+# Keys taken from the nested sleep summary, None when it is missing
+_SLEEP_SUMMARY_KEYS = (
+    'deep_sleep_hours', 'light_sleep_hours', 'rem_sleep_hours', 'awake_hours',
+    'average_spo2', 'average_respiration',
+)
+
+_read_heart_rate_summary = _attr_reader((
+    ('resting_heart_rate', 'resting_heart_rate'),
+    ('max_heart_rate', 'max_heart_rate'),
+    ('min_heart_rate', 'min_heart_rate'),
+))
+
+_read_stress_summary = _attr_reader((
+    ('avg_stress_level', 'avg_stress_level'),
+    ('max_stress_level', 'max_stress_level'),
+))
+
+_read_body_battery_summary = _attr_reader((
+    ('body_battery_high', 'body_battery_highest_value'),
+    ('body_battery_low', 'body_battery_lowest_value'),
+))
+
+_read_training_readiness = _attr_reader((
+    ('training_readiness_score', 'score'),
+    ('training_readiness_level', 'level'),
+    ('training_readiness_feedback', 'feedback_short'),
+))
+
+_read_hrv_summary = _attr_reader((
+    ('hrv_weekly_avg', 'weekly_avg'),
+    ('hrv_last_night_avg', 'last_night_avg'),
+    ('hrv_status', 'status'),
+))
+
+_read_respiration = _attr_reader((
+    ('average_respiration', 'average_respiration_value'),
+    ('avg_waking_respiration_value', 'avg_waking_respiration_value'),
+    ('avg_sleep_respiration_value', 'avg_sleep_respiration_value'),
+    ('lowest_respiration_value', 'lowest_respiration_value'),
+    ('highest_respiration_value', 'highest_respiration_value'),
+))
+
+_read_steps = _attr_reader((
+    ('total_steps', 'total_steps'),
+    ('step_goal', 'step_goal'),
+))
+
+_read_calories = _attr_reader((
+    ('total_calories', 'total_kilocalories'),
+    ('active_calories', 'active_kilocalories'),
+    ('bmr_calories', 'bmr_kilocalories'),
+))
+
+
 class DataExtractor:
     """Extracts and normalizes data from API responses for database storage."""
     
-    def extract_metric_data(self, data: Any, metric_type: MetricType) -> Optional[Dict]:
+    def extract_metric_data(self, data: Any, metric_type: MetricType) -> Optional[Dict[str, Any]]:
         """Extract data based on metric type."""
-        if metric_type == MetricType.DAILY_SUMMARY:
-            return self._extract_daily_summary_data(data)
-        elif metric_type == MetricType.SLEEP:
-            return self._extract_sleep_data(data)
-        elif metric_type == MetricType.TRAINING_READINESS:
-            return self._extract_training_readiness_data(data)
-        elif metric_type == MetricType.HRV:
-            return self._extract_hrv_data(data)
-        elif metric_type == MetricType.RESPIRATION:
-            return self._extract_respiration_summary(data)
-        elif metric_type == MetricType.ACTIVITIES:
-            return self._extract_activity_data(data)
-        elif metric_type == MetricType.STEPS:
-            return self._extract_steps_data(data)
-        elif metric_type == MetricType.CALORIES:
-            return self._extract_calories_data(data)
-        elif metric_type == MetricType.HEART_RATE:
-            return self._extract_heart_rate_summary(data)
-        elif metric_type == MetricType.STRESS:
-            return self._extract_stress_summary(data)
-        elif metric_type == MetricType.BODY_BATTERY:
-            return self._extract_body_battery_summary(data)
-        else:
-            return None
+        handler = self._DISPATCH.get(metric_type)
+        return handler(self, data) if handler else None
     
     def _extract_daily_summary_data(self, data: Any) -> Dict[str, Any]:
         """Extract daily summary data."""
-        return {
-            # Steps and movement
-            'total_steps': getattr(data, 'total_steps', None),
-            'step_goal': getattr(data, 'daily_step_goal', None),  # Correct attribute name!
-            'total_distance_meters': getattr(data, 'total_distance_meters', None),
-            
-            # Calories
-            'total_calories': getattr(data, 'total_kilocalories', None),
-            'active_calories': getattr(data, 'active_kilocalories', None),
-            'bmr_calories': getattr(data, 'bmr_kilocalories', None),
-            
-            # Heart rate
-            'resting_heart_rate': getattr(data, 'resting_heart_rate', None),
-            'max_heart_rate': getattr(data, 'max_heart_rate', None),
-            'min_heart_rate': getattr(data, 'min_heart_rate', None),
-            'average_heart_rate': getattr(data, 'average_heart_rate', None),
-            
-            # Stress and recovery
-            'avg_stress_level': getattr(data, 'avg_stress_level', None) or getattr(data, 'stress_avg', None),
-            'max_stress_level': getattr(data, 'max_stress_level', None) or getattr(data, 'stress_max', None),
-            'body_battery_high': getattr(data, 'body_battery_highest_value', None),
-            'body_battery_low': getattr(data, 'body_battery_lowest_value', None),
-            
-            # Additional metrics that might be in daily summary
-            'average_spo2': getattr(data, 'average_sp_o2_value', None),
-            'average_respiration': getattr(data, 'average_respiration_value', None)
-        }
+        result = _read_daily_summary(data)
+        result['avg_stress_level'] = result['avg_stress_level'] or getattr(data, 'stress_avg', None)
+        result['max_stress_level'] = result['max_stress_level'] or getattr(data, 'stress_max', None)
+        return result
     
     def _extract_sleep_data(self, data: Any) -> Dict[str, Any]:
-        """Extract sleep data from Sleep object - use the properties, stupid!"""
+        """Extract sleep data from Sleep object.
+        
+        Durations and stage percentages are derived from the nested sleep
+        summary in one pass, sharing a single division by total sleep time.
+        """
+        summary = getattr(data, 'sleep_summary', None)
+        if not summary:
+            # No summary to derive from - fall back to whatever the object exposes
+            result = _read_sleep_percentages(data)
+            result.update(dict.fromkeys(_SLEEP_SUMMARY_KEYS))
+            return result
+        
+        _g = getattr
+        total = _g(summary, 'sleep_time_seconds', 0)
+        deep = _g(summary, 'deep_sleep_seconds', 0)
+        light = _g(summary, 'light_sleep_seconds', 0)
+        rem = _g(summary, 'rem_sleep_seconds', 0)
+        awake = _g(summary, 'awake_sleep_seconds', 0)
+        
+        # Same convention as the Sleep properties: 0% when no sleep was recorded
+        scale = 100.0 / total if total > 0 else 0
+        
         return {
-            # Use the built-in properties from Sleep class
-            'sleep_duration_hours': getattr(data, 'sleep_duration_hours', None),
-            'deep_sleep_percentage': getattr(data, 'deep_sleep_percentage', None),
-            'light_sleep_percentage': getattr(data, 'light_sleep_percentage', None),
-            'rem_sleep_percentage': getattr(data, 'rem_sleep_percentage', None),
-            'awake_percentage': getattr(data, 'awake_percentage', None),
+            'sleep_duration_hours': total / 3600,
+            'deep_sleep_percentage': deep * scale,
+            'light_sleep_percentage': light * scale,
+            'rem_sleep_percentage': rem * scale,
+            'awake_percentage': awake * scale,
             
-            # Calculate hours from the summary if available
-            'deep_sleep_hours': getattr(data.sleep_summary, 'deep_sleep_seconds', 0) / 3600 if hasattr(data, 'sleep_summary') and data.sleep_summary and getattr(data.sleep_summary, 'deep_sleep_seconds', 0) > 0 else None,
-            'light_sleep_hours': getattr(data.sleep_summary, 'light_sleep_seconds', 0) / 3600 if hasattr(data, 'sleep_summary') and data.sleep_summary and getattr(data.sleep_summary, 'light_sleep_seconds', 0) > 0 else None,
-            'rem_sleep_hours': getattr(data.sleep_summary, 'rem_sleep_seconds', 0) / 3600 if hasattr(data, 'sleep_summary') and data.sleep_summary and getattr(data.sleep_summary, 'rem_sleep_seconds', 0) > 0 else None,
-            'awake_hours': getattr(data.sleep_summary, 'awake_sleep_seconds', 0) / 3600 if hasattr(data, 'sleep_summary') and data.sleep_summary and getattr(data.sleep_summary, 'awake_sleep_seconds', 0) > 0 else None,
+            'deep_sleep_hours': deep / 3600 if deep > 0 else None,
+            'light_sleep_hours': light / 3600 if light > 0 else None,
+            'rem_sleep_hours': rem / 3600 if rem > 0 else None,
+            'awake_hours': awake / 3600 if awake > 0 else None,
             
             # Physiological data from summary
-            'average_spo2': getattr(data.sleep_summary, 'average_sp_o2_value', None) if hasattr(data, 'sleep_summary') and data.sleep_summary else None,
-            'average_respiration': getattr(data.sleep_summary, 'average_respiration_value', None) if hasattr(data, 'sleep_summary') and data.sleep_summary else None
+            'average_spo2': _g(summary, 'average_sp_o2_value', None),
+            'average_respiration': _g(summary, 'average_respiration_value', None)
         }
     
     def _extract_heart_rate_summary(self, data: Any) -> Dict[str, Any]:
@@ -91,67 +215,41 @@ class DataExtractor:
         # Heart rate data is in heart_rate_summary nested object
         summary = getattr(data, 'heart_rate_summary', data)
         
-        return {
-            'resting_heart_rate': getattr(summary, 'resting_heart_rate', None),
-            'max_heart_rate': getattr(summary, 'max_heart_rate', None),
-            'min_heart_rate': getattr(summary, 'min_heart_rate', None),
-            'average_heart_rate': getattr(data, 'average_heart_rate', None)  # This is on main object
-        }
+        result = _read_heart_rate_summary(summary)
+        result['average_heart_rate'] = getattr(data, 'average_heart_rate', None)  # This is on main object
+        return result
     
     def _extract_stress_summary(self, data: Any) -> Dict[str, Any]:
         """Extract stress summary data."""
-        return {
-            'avg_stress_level': getattr(data, 'avg_stress_level', None) or getattr(data, 'stress_avg', None),
-            'max_stress_level': getattr(data, 'max_stress_level', None) or getattr(data, 'stress_max', None)
-        }
+        result = _read_stress_summary(data)
+        result['avg_stress_level'] = result['avg_stress_level'] or getattr(data, 'stress_avg', None)
+        result['max_stress_level'] = result['max_stress_level'] or getattr(data, 'stress_max', None)
+        return result
     
     def _extract_body_battery_summary(self, data: Any) -> Dict[str, Any]:
         """Extract body battery summary data."""
-        return {
-            'body_battery_high': getattr(data, 'body_battery_highest_value', None) or getattr(data, 'highest_value', None),
-            'body_battery_low': getattr(data, 'body_battery_lowest_value', None) or getattr(data, 'lowest_value', None)
-        }
+        result = _read_body_battery_summary(data)
+        result['body_battery_high'] = result['body_battery_high'] or getattr(data, 'highest_value', None)
+        result['body_battery_low'] = result['body_battery_low'] or getattr(data, 'lowest_value', None)
+        return result
     
     def _extract_training_readiness_data(self, data: Any) -> Dict[str, Any]:
         """Extract training readiness nested data."""
-        return {
-            'score': getattr(data, 'score', None),
-            'level': getattr(data, 'level', None),
-            'feedback': getattr(data, 'feedback_short', None)
-        }
+        return _read_training_readiness(data)
     
     def _extract_hrv_data(self, data: Any) -> Dict[str, Any]:
         """Extract HRV using nested summary."""
-        hrv_summary = getattr(data, 'hrv_summary', None)
-        if hrv_summary:
-            return {
-                'weekly_avg': getattr(hrv_summary, 'weekly_avg', None),
-                'last_night_avg': getattr(hrv_summary, 'last_night_avg', None),
-                'status': getattr(hrv_summary, 'status', None)
-            }
-        return {}
+        return _read_nested(data, 'hrv_summary', _read_hrv_summary) or {}
     
     def _extract_respiration_summary(self, data: Any) -> Dict[str, Any]:
         """Extract respiration summary - unique respiratory metrics."""
         # Try different possible locations for respiration data
-        summary = getattr(data, 'respiration_summary', None)
-        if summary:
-            return {
-                'average_respiration': getattr(summary, 'average_respiration_value', None),
-                'avg_waking_respiration_value': getattr(summary, 'avg_waking_respiration_value', None),
-                'avg_sleep_respiration_value': getattr(summary, 'avg_sleep_respiration_value', None),
-                'lowest_respiration_value': getattr(summary, 'lowest_respiration_value', None),
-                'highest_respiration_value': getattr(summary, 'highest_respiration_value', None)
-            }
+        result = _read_nested(data, 'respiration_summary', _read_respiration)
+        if result is not None:
+            return result
         
         # Also try direct attributes
-        result = {
-            'average_respiration': getattr(data, 'average_respiration_value', None),
-            'avg_waking_respiration_value': getattr(data, 'avg_waking_respiration_value', None),
-            'avg_sleep_respiration_value': getattr(data, 'avg_sleep_respiration_value', None),
-            'lowest_respiration_value': getattr(data, 'lowest_respiration_value', None),
-            'highest_respiration_value': getattr(data, 'highest_respiration_value', None)
-        }
+        result = _read_respiration(data)
         
         # Return only if we have any data
         if any(v is not None for v in result.values()):
@@ -161,74 +259,99 @@ class DataExtractor:
     
     def _extract_activity_data(self, data: Any) -> Dict[str, Any]:
         """Extract activity data from both parsed and raw formats."""
-        # Handle both object attributes and dict keys
-        def get_value(obj, *keys):
-            for key in keys:
-                if hasattr(obj, key):
-                    return getattr(obj, key, None)
-                elif isinstance(obj, dict) and key in obj:
-                    return obj[key]
-            return None
-        
-        activity_id = get_value(data, 'activity_id', 'activityId')
+        activity_id = _first_present(data, _ACTIVITY_ID_ALIASES)
         if activity_id:
-            return {
-                'activity_id': activity_id,
-                'activity_name': get_value(data, 'activity_name', 'activityName', 'activityTypeName'),
-                'duration_seconds': get_value(data, 'duration', 'movingDuration', 'elapsedDuration'),
-                'avg_heart_rate': get_value(data, 'average_hr', 'averageHR', 'avgHR'),
-                'training_load': get_value(data, 'activity_training_load', 'trainingLoad'),
-                'start_time': get_value(data, 'start_time_local', 'startTimeLocal', 'start_time')
-            }
+            result = {'activity_id': activity_id}
+            for key, aliases in _ACTIVITY_FIELDS:
+                result[key] = _first_present(data, aliases)
+            return result
         return {}
     
     def extract_timeseries_data(self, data: Any, metric_type: MetricType) -> List[Tuple]:
         """Extract timeseries data points from Garmy metrics."""
-        timeseries_data = []
-        
-        if metric_type == MetricType.BODY_BATTERY:
-            if hasattr(data, 'body_battery_readings') and data.body_battery_readings:
-                for reading in data.body_battery_readings:
-                    metadata = {
-                        'status': getattr(reading, 'status', None),
-                        'version': getattr(reading, 'version', None)
-                    }
-                    timeseries_data.append((reading.timestamp, reading.level, metadata))
-                    
-        elif metric_type == MetricType.STRESS:
-            if hasattr(data, 'stress_readings') and data.stress_readings:
-                for reading in data.stress_readings:
-                    metadata = {}
-                    if hasattr(reading, 'stress_category'):
-                        metadata['stress_category'] = reading.stress_category
-                    timeseries_data.append((reading.timestamp, reading.stress_level, metadata))
-                    
-        elif metric_type == MetricType.HEART_RATE:
-            if hasattr(data, 'heart_rate_values_array') and data.heart_rate_values_array:
-                for reading in data.heart_rate_values_array:
-                    if isinstance(reading, (list, tuple)) and len(reading) >= 2:
-                        timestamp, heart_rate = reading[0], reading[1]
-                        timeseries_data.append((timestamp, heart_rate, {}))
-        
-        elif metric_type == MetricType.RESPIRATION:
-            # Respiration might have different format - check if it has readings
-            if hasattr(data, 'respiration_readings') and data.respiration_readings:
-                for reading in data.respiration_readings:
-                    timeseries_data.append((reading.timestamp, reading.value, {}))
-        
-        return timeseries_data
+        handler = self._TS_DISPATCH.get(metric_type)
+        return handler(self, data) if handler else []
+    
+    def _extract_body_battery_timeseries(self, data: Any) -> List[Tuple]:
+        """Extract body battery readings."""
+        readings = getattr(data, 'body_battery_readings', None)
+        if not readings:
+            return []
+        # Local bindings keep the per-reading loop free of global/attribute lookups
+        _getattr = getattr
+        empty_meta = _EMPTY_META
+        points: List[Tuple[Any, Any, Dict[str, Any]]] = []
+        append = points.append
+        for reading in readings:
+            status = _getattr(reading, 'status', None)
+            version = _getattr(reading, 'version', None)
+            if status is None and version is None:
+                metadata = empty_meta
+            else:
+                metadata = {'status': status, 'version': version}
+            append((reading.timestamp, reading.level, metadata))
+        return points
+    
+    def _extract_stress_timeseries(self, data: Any) -> List[Tuple]:
+        """Extract stress readings."""
+        readings = getattr(data, 'stress_readings', None)
+        if not readings:
+            return []
+        _getattr = getattr
+        missing = _MISSING
+        empty_meta = _EMPTY_META
+        points: List[Tuple[Any, Any, Dict[str, Any]]] = []
+        append = points.append
+        for reading in readings:
+            category = _getattr(reading, 'stress_category', missing)
+            metadata = empty_meta if category is missing else {'stress_category': category}
+            append((reading.timestamp, reading.stress_level, metadata))
+        return points
+    
+    def _extract_heart_rate_timeseries(self, data: Any) -> List[Tuple]:
+        """Extract heart rate [timestamp, value] pairs."""
+        readings = getattr(data, 'heart_rate_values_array', None)
+        if not readings:
+            return []
+        return [
+            (reading[0], reading[1], _EMPTY_META)
+            for reading in readings
+            if isinstance(reading, (list, tuple)) and len(reading) >= 2
+        ]
+    
+    def _extract_respiration_timeseries(self, data: Any) -> List[Tuple]:
+        """Extract respiration readings."""
+        # Respiration might have different format - check if it has readings
+        readings = getattr(data, 'respiration_readings', None)
+        if not readings:
+            return []
+        return [(reading.timestamp, reading.value, _EMPTY_META) for reading in readings]
     
     def _extract_steps_data(self, data: Any) -> Dict[str, Any]:
         """Extract steps data."""
-        return {
-            'total_steps': getattr(data, 'total_steps', None),
-            'step_goal': getattr(data, 'step_goal', None)
-        }
+        return _read_steps(data)
     
     def _extract_calories_data(self, data: Any) -> Dict[str, Any]:
         """Extract calories data."""
-        return {
-            'total_calories': getattr(data, 'total_kilocalories', None),
-            'active_calories': getattr(data, 'active_kilocalories', None),
-            'bmr_calories': getattr(data, 'bmr_kilocalories', None)
-        }
\ No newline at end of file
+        return _read_calories(data)
+    
+    # Per-metric handlers, resolved once when the class is created
+    _DISPATCH: ClassVar[Dict[MetricType, Callable[['DataExtractor', Any], Dict[str, Any]]]] = {
+        MetricType.DAILY_SUMMARY: _extract_daily_summary_data,
+        MetricType.SLEEP: _extract_sleep_data,
+        MetricType.TRAINING_READINESS: _extract_training_readiness_data,
+        MetricType.HRV: _extract_hrv_data,
+        MetricType.RESPIRATION: _extract_respiration_summary,
+        MetricType.ACTIVITIES: _extract_activity_data,
+        MetricType.STEPS: _extract_steps_data,
+        MetricType.CALORIES: _extract_calories_data,
+        MetricType.HEART_RATE: _extract_heart_rate_summary,
+        MetricType.STRESS: _extract_stress_summary,
+        MetricType.BODY_BATTERY: _extract_body_battery_summary,
+    }
+    _TS_DISPATCH: ClassVar[Dict[MetricType, Callable[['DataExtractor', Any], List[Tuple]]]] = {
+        MetricType.BODY_BATTERY: _extract_body_battery_timeseries,
+        MetricType.STRESS: _extract_stress_timeseries,
+        MetricType.HEART_RATE: _extract_heart_rate_timeseries,
+        MetricType.RESPIRATION: _extract_respiration_timeseries,
+    }
\ No newline at end of file
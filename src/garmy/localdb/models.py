@@ -3,15 +3,19 @@
 from datetime import date, datetime
 from enum import Enum
 
-from sqlalchemy import Column, Integer, String, Float, Date, DateTime, JSON, Text
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Index, JSON, Text
 from sqlalchemy.orm import declarative_base
 
 
 Base = declarative_base()
 
 
-class MetricType(Enum):
-    """Health metric types that can be stored in the database."""
+class MetricType(str, Enum):
+    """Health metric types that can be stored in the database.
+
+    Members are also ``str`` instances, so they compare equal to and hash
+    like their stored values.
+    """
     DAILY_SUMMARY = "daily_summary"
     SLEEP = "sleep"
     ACTIVITIES = "activities"
@@ -28,17 +32,25 @@ class MetricType(Enum):
 class TimeSeries(Base):
     """High-frequency timeseries data (heart rate, stress, body battery, etc.)."""
     __tablename__ = "timeseries"
+    # Store rows clustered by the primary key instead of a hidden rowid.
+    __table_args__ = {"sqlite_with_rowid": False}
 
     user_id = Column(Integer, primary_key=True, nullable=False)
     metric_type = Column(String, primary_key=True, nullable=False)
     timestamp = Column(Integer, primary_key=True, nullable=False)
     value = Column(Float, nullable=False)
-    meta_data = Column(JSON)
+    meta_data = Column(JSON(none_as_null=True))  # NULL when a reading has no metadata
 
 
 class Activity(Base):
     """Individual activities and workouts with key metrics."""
     __tablename__ = "activities"
+    __table_args__ = (
+        # Date-range scans per user; the primary key is keyed by activity_id.
+        Index("idx_activities_user_date", "user_id", "activity_date"),
+        # Filtering by activity name, optionally within a date range.
+        Index("idx_activities_user_name_date", "user_id", "activity_name", "activity_date"),
+    )
 
     user_id = Column(Integer, primary_key=True, nullable=False)
     activity_id = Column(String, primary_key=True, nullable=False)
@@ -54,6 +66,7 @@ class Activity(Base):
 class DailyHealthMetric(Base):
     """Normalized daily health metrics with dedicated columns for efficient querying."""
     __tablename__ = "daily_health_metrics"
+    __table_args__ = {"sqlite_with_rowid": False}
 
     user_id = Column(Integer, primary_key=True, nullable=False)
     metric_date = Column(Date, primary_key=True, nullable=False)
@@ -111,6 +124,7 @@ class DailyHealthMetric(Base):
 class SyncStatus(Base):
     """Sync status tracking for each metric per date."""
     __tablename__ = "sync_status"
+    __table_args__ = {"sqlite_with_rowid": False}
 
     user_id = Column(Integer, primary_key=True, nullable=False)
     sync_date = Column(Date, primary_key=True, nullable=False)
@@ -2,8 +2,10 @@
 
 import logging
 from datetime import date
-from typing import Optional
-from tqdm import tqdm
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from tqdm import tqdm
 
 
 class ProgressReporter:
@@ -12,51 +14,50 @@ class ProgressReporter:
     def __init__(self, use_tqdm: bool = False):
         self.use_tqdm = use_tqdm
         self.logger = logging.getLogger("garmy.sync")
-        self.pbar: Optional[tqdm] = None
+        self.pbar: Optional['tqdm'] = None
         self.current_date = None
 
     def start_sync(self, total: int):
         """Start sync progress tracking."""
         if self.use_tqdm:
+            # Imported on demand so log-only syncs do not pay for loading tqdm
+            from tqdm import tqdm
             self.pbar = tqdm(total=total)
 
+    def _advance(self, sync_date: date) -> bool:
+        """Advance the progress bar by one task; False when there is no bar."""
+        if not self.pbar:
+            return False
+        self.pbar.update(1)
+        if self.current_date != sync_date:
+            self.current_date = sync_date
+            # Let tqdm's own refresh interval repaint the new description.
+            self.pbar.set_description(f"Syncing {sync_date}", refresh=False)
+        return True
+
     def task_complete(self, task: str, sync_date: date):
         """Mark task as completed."""
-        msg = f"[{sync_date}] {task}"
-        if self.pbar:
-            self.pbar.update(1)
-            if self.current_date != sync_date:
-                self.current_date = sync_date
-                self.pbar.set_description(f"Syncing {sync_date}")
-        else:
-            self.logger.info(msg)
+        if not self._advance(sync_date):
+            self.logger.info("[%s] %s", sync_date, task)
 
     def task_skipped(self, task: str, sync_date: date):
         """Mark task as skipped."""
-        msg = f"[{sync_date}] {task} (skipped)"
-        if self.pbar:
-            self.pbar.update(1)
-            if self.current_date != sync_date:
-                self.current_date = sync_date
-                self.pbar.set_description(f"Syncing {sync_date}")
-        else:
-            self.logger.info(msg)
+        if not self._advance(sync_date):
+            self.logger.info("[%s] %s (skipped)", sync_date, task)
 
     def task_failed(self, task: str, sync_date: date):
         """Mark task as failed."""
-        msg = f"[{sync_date}] {task} (failed)"
-        if self.pbar:
-            self.pbar.update(1)
-            if self.current_date != sync_date:
-                self.current_date = sync_date
-                self.pbar.set_description(f"Syncing {sync_date}")
-        else:
-            self.logger.warning(msg)
+        if not self._advance(sync_date):
+            self.logger.warning("[%s] %s (failed)", sync_date, task)
 
     def info(self, message: str):
         """Log info message."""
         self.logger.info(message)
     
+    def warning(self, message: str):
+        """Log warning message."""
+        self.logger.warning(message)
+    
     def error(self, message: str):
         """Log error message."""
         self.logger.error(message)
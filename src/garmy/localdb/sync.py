@@ -1,8 +1,7 @@
 """Synchronization manager for Garmin health data."""
 
-import asyncio
 from datetime import date, datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import Any, List, Dict, Optional, Tuple
 from pathlib import Path
 
 from .db import HealthDB
@@ -13,6 +12,23 @@ from .extractors import DataExtractor
 from .activities_iterator import ActivitiesIterator
 
 
+# Metrics that also carry intraday readings for the timeseries table
+_TIMESERIES_METRICS = frozenset((
+    MetricType.BODY_BATTERY, MetricType.STRESS, MetricType.HEART_RATE, MetricType.RESPIRATION
+))
+
+# Longest exception text kept in sync_status.error_message
+_MAX_ERROR_MESSAGE_LENGTH = 500
+
+
+def _error_message(error: Exception) -> str:
+    """Return exception text truncated for storage with a sync status."""
+    message = str(error)
+    if len(message) > _MAX_ERROR_MESSAGE_LENGTH:
+        message = message[:_MAX_ERROR_MESSAGE_LENGTH - 3] + '...'
+    return message
+
+
 class SyncManager:
     """Synchronization manager for health metrics."""
 
@@ -83,7 +99,6 @@ class SyncManager:
         if metrics is None:
             metrics = list(MetricType)
 
-        non_activities_metrics = [m for m in metrics if m != MetricType.ACTIVITIES]
         total_tasks = date_count * len(metrics)
 
         self.progress.start_sync(total_tasks)
@@ -91,40 +106,48 @@ class SyncManager:
         stats = {'completed': 0, 'skipped': 0, 'failed': 0, 'total_tasks': total_tasks}
 
         try:
+            range_start, range_end = min(start_date, end_date), max(start_date, end_date)
+            sync_statuses = self.db.get_sync_statuses(user_id, range_start, range_end)
+            self.db.create_pending_sync_statuses(user_id, [
+                (current_date, metric_type)
+                for current_date in self._date_range(start_date, end_date)
+                for metric_type in metrics
+                if (current_date, metric_type.value) not in sync_statuses
+            ])
+
             for current_date in self._date_range(start_date, end_date):
-                for metric_type in metrics:
-                    if not self.db.sync_status_exists(user_id, current_date, metric_type):
-                        self.db.create_sync_status(user_id, current_date, metric_type, 'pending')
-            
-            for current_date in self._date_range(start_date, end_date):
-                self._sync_date(user_id, current_date, metrics, stats)
+                self._sync_date(user_id, current_date, metrics, stats, sync_statuses)
 
-        except Exception as e:
-            raise
         finally:
             self.progress.end_sync()
 
         return stats
 
-    def _sync_date(self, user_id: int, sync_date: date, metrics: List[MetricType], stats: Dict[str, int]):
+    def _sync_date(self, user_id: int, sync_date: date, metrics: List[MetricType], stats: Dict[str, int],
+                   sync_statuses: Optional[Dict[Tuple[date, str], str]] = None):
         """Sync all metrics for a single date."""
         for metric_type in metrics:
             try:
-                if metric_type == MetricType.ACTIVITIES:
+                if metric_type is MetricType.ACTIVITIES:
                     self._sync_activities_for_date(user_id, sync_date, stats)
                 else:
-                    self._sync_metric_for_date(user_id, sync_date, metric_type, stats)
+                    self._sync_metric_for_date(user_id, sync_date, metric_type, stats, sync_statuses)
 
             except Exception as e:
-                self.db.update_sync_status(user_id, sync_date, metric_type, 'failed', str(e))
-                self.progress.task_failed(f"{metric_type.value}", sync_date)
+                self.db.update_sync_status(user_id, sync_date, metric_type, 'failed', _error_message(e))
+                self.progress.task_failed(metric_type.value, sync_date)
                 stats['failed'] += 1
 
-    def _sync_metric_for_date(self, user_id: int, sync_date: date, metric_type: MetricType, stats: Dict[str, int]):
-        """Sync a single metric for a date."""
-        if self._is_metric_completed(user_id, metric_type, sync_date):
+    def _sync_metric_for_date(self, user_id: int, sync_date: date, metric_type: MetricType, stats: Dict[str, int],
+                              sync_statuses: Optional[Dict[Tuple[date, str], str]] = None):
+        """Sync a single metric for a date.
+
+        If sync_statuses is given, the completed check is answered from it
+        instead of the database.
+        """
+        if self._is_metric_completed(user_id, metric_type, sync_date, sync_statuses):
             stats['skipped'] += 1
-            self.progress.task_skipped(f"{metric_type.value}", sync_date)
+            self.progress.task_skipped(metric_type.value, sync_date)
             return
 
         try:
@@ -141,7 +164,7 @@ class SyncManager:
             
             # Also extract timeseries data for applicable metrics
             timeseries_stored = False
-            if metric_type in [MetricType.BODY_BATTERY, MetricType.STRESS, MetricType.HEART_RATE, MetricType.RESPIRATION]:
+            if metric_type in _TIMESERIES_METRICS:
                 timeseries_data = self.extractor.extract_timeseries_data(data, metric_type)
                 if timeseries_data:
                     self.db.store_timeseries_batch(user_id, metric_type, timeseries_data)
@@ -155,11 +178,11 @@ class SyncManager:
                 self.db.update_sync_status(user_id, sync_date, metric_type, 'skipped')
                 stats['skipped'] += 1
 
-            self.progress.task_complete(f"{metric_type.value}", sync_date)
+            self.progress.task_complete(metric_type.value, sync_date)
 
         except Exception as e:
-            self.db.update_sync_status(user_id, sync_date, metric_type, 'failed', str(e))
-            self.progress.task_failed(f"{metric_type.value}", sync_date)
+            self.db.update_sync_status(user_id, sync_date, metric_type, 'failed', _error_message(e))
+            self.progress.task_failed(metric_type.value, sync_date)
             stats['failed'] += 1
 
     def _sync_activities_for_date(self, user_id: int, sync_date: date, stats: Dict[str, int]):
@@ -171,55 +194,53 @@ class SyncManager:
         try:
             activities = self.activities_iterator.get_activities_for_date(sync_date)
 
+            # Activities for the date keyed by ID, so the stored ones can be
+            # found with a single query
+            fetched_activities: Dict[str, Dict] = {}
             for activity in activities:
                 activity_data = self.extractor.extract_metric_data(activity, MetricType.ACTIVITIES)
                 if not activity_data or 'activity_id' not in activity_data:
                     continue
 
-                activity_id = activity_data['activity_id']
-
-                if self.db.activity_exists(user_id, activity_id):
+                activity_id = str(activity_data['activity_id'])
+                if activity_id in fetched_activities:
                     stats['skipped'] += 1
                     continue
+                fetched_activities[activity_id] = activity_data
 
-                activity_data['activity_date'] = sync_date
+            existing_ids = self.db.get_existing_activity_ids(user_id, fetched_activities)
+            stats['skipped'] += len(existing_ids)
 
-                self.db.store_activity(user_id, activity_data)
-                stats['completed'] += 1
+            # New activities for the date, stored in one transaction
+            new_activities = [
+                dict(activity_data, activity_date=sync_date)
+                for activity_id, activity_data in fetched_activities.items()
+                if activity_id not in existing_ids
+            ]
+            self.db.store_activities(user_id, new_activities)
+            stats['completed'] += len(new_activities)
 
             self.progress.task_complete("activities", sync_date)
 
-        except Exception as e:
+        except Exception:
             self.progress.task_failed("activities", sync_date)
             stats['failed'] += 1
 
     def _store_health_metric(self, user_id: int, sync_date: date, metric_type: MetricType, data: Dict):
-        """Store health metric data in normalized table."""
-        if metric_type == MetricType.DAILY_SUMMARY:
-            self.db.store_health_metric(user_id, sync_date, **data)
-        elif metric_type == MetricType.SLEEP:
-            self.db.store_health_metric(user_id, sync_date, **data)
-        elif metric_type == MetricType.TRAINING_READINESS:
-            self.db.store_health_metric(
-                user_id, sync_date,
-                training_readiness_score=data.get('score'),
-                training_readiness_level=data.get('level'),
-                training_readiness_feedback=data.get('feedback')
-            )
-        elif metric_type == MetricType.HRV:
-            self.db.store_health_metric(
-                user_id, sync_date,
-                hrv_weekly_avg=data.get('weekly_avg'),
-                hrv_last_night_avg=data.get('last_night_avg'),
-                hrv_status=data.get('status')
-            )
-        elif metric_type in [MetricType.RESPIRATION, MetricType.HEART_RATE, MetricType.STRESS, MetricType.BODY_BATTERY, MetricType.STEPS, MetricType.CALORIES]:
-            # Store all extracted data for these metrics
-            self.db.store_health_metric(user_id, sync_date, **data)
+        """Store health metric data in normalized table.
+        
+        Extractors emit daily_health_metrics column names, so the extracted
+        fields are written as-is for every metric type.
+        """
+        self.db.store_health_metric(user_id, sync_date, **data)
 
-    def _is_metric_completed(self, user_id: int, metric_type: MetricType, sync_date: date) -> bool:
+    def _is_metric_completed(self, user_id: int, metric_type: MetricType, sync_date: date,
+                             sync_statuses: Optional[Dict[Tuple[date, str], str]] = None) -> bool:
         """Check if metric is already completed."""
-        status = self.db.get_sync_status(user_id, sync_date, metric_type)
+        if sync_statuses is not None:
+            status = sync_statuses.get((sync_date, metric_type.value))
+        else:
+            status = self.db.get_sync_status(user_id, sync_date, metric_type)
         return status == 'completed'
 
     def _date_range(self, start_date: date, end_date: date):
@@ -245,9 +266,17 @@ class SyncManager:
         start_ts = int(start_time.timestamp()) * self.config.database.ms_per_second
         end_ts = int(end_time.timestamp()) * self.config.database.ms_per_second
 
-        data = self.db.get_timeseries(user_id, metric_type, start_ts, end_ts)
+        data = self.db.iter_timeseries(user_id, metric_type, start_ts, end_ts)
         return [{
             'timestamp': ts,
             'value': value,
             'metadata': metadata
         } for ts, value, metadata in data]
+
+    def aggregate_timeseries(self, user_id: int, metric_type: MetricType,
+                             start_time: datetime, end_time: datetime) -> Dict[str, Any]:
+        """Get count, min, max and avg of timeseries values for time range."""
+        start_ts = int(start_time.timestamp()) * self.config.database.ms_per_second
+        end_ts = int(end_time.timestamp()) * self.config.database.ms_per_second
+
+        return self.db.aggregate_timeseries(user_id, metric_type, start_ts, end_ts)
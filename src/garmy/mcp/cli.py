@@ -139,13 +139,12 @@ def cmd_info(args):
             tables_query = "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
             tables = db_manager.execute_safe_query(tables_query)
             
+            table_names = [table['name'] for table in tables]
+            row_counts = db_manager.count_rows(table_names)
+            
             print(f"\\nAvailable tables: {len(tables)}")
-            for table in tables:
-                table_name = table['name']
-                count_query = f"SELECT COUNT(*) as count FROM {table_name}"
-                count_result = db_manager.execute_safe_query(count_query)
-                row_count = count_result[0]['count'] if count_result else 0
-                print(f"  - {table_name}: {row_count:,} records")
+            for table_name in table_names:
+                print(f"  - {table_name}: {row_counts[table_name]:,} records")
             
         except Exception as e:
             print(f"\\nWarning: Could not analyze database structure: {e}")
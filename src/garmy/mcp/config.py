@@ -20,6 +20,9 @@ class MCPConfig:
     enable_query_logging: bool = False
     strict_validation: bool = True
     
+    # Performance settings
+    mmap_size: int = 1024 * 1024 * 1024  # Bytes of the database to memory-map (0 disables)
+    
     @classmethod
     def from_db_path(cls, db_path: Path, **kwargs) -> "MCPConfig":
         """Create config with database path and optional overrides."""
@@ -37,4 +40,7 @@ class MCPConfig:
             raise ValueError(f"max_rows cannot exceed {self.max_rows_absolute}")
         
         if self.max_rows <= 0:
-            raise ValueError("max_rows must be positive")
\ No newline at end of file
+            raise ValueError("max_rows must be positive")
+        
+        if self.mmap_size < 0:
+            raise ValueError("mmap_size cannot be negative")
\ No newline at end of file
@@ -23,17 +23,81 @@ from .config import MCPConfig
 from ..localdb.models import MetricType
 
 
+# Fixed SQL used by the MCP tools, kept at module level so the same string
+# objects are reused for every call.
+_SQL_LIST_TABLES = """
+    SELECT name FROM sqlite_master 
+    WHERE type='table' 
+    ORDER BY name
+"""
+
+_SQL_TABLE_DEFINITIONS = """
+    SELECT name, sql FROM sqlite_master 
+    WHERE type='table' 
+    ORDER BY name
+"""
+
+_SQL_HEALTH_SUMMARY = """
+    WITH health AS (
+        SELECT 
+            COUNT(*) as total_days_with_data,
+            ROUND(AVG(total_steps), 0) as avg_daily_steps,
+            ROUND(AVG(sleep_duration_hours), 1) as avg_sleep_hours,
+            ROUND(AVG(resting_heart_rate), 0) as avg_resting_hr,
+            ROUND(AVG(avg_stress_level), 0) as avg_stress_level,
+            MIN(metric_date) as earliest_data_date,
+            MAX(metric_date) as latest_data_date
+        FROM daily_health_metrics 
+        WHERE user_id = ?1 
+        AND metric_date >= date('now', '-' || ?2 || ' days')
+    ),
+    activity AS (
+        SELECT COUNT(*) as total_activities
+        FROM activities 
+        WHERE user_id = ?1 
+        AND activity_date >= date('now', '-' || ?2 || ' days')
+    )
+    SELECT health.*, activity.total_activities
+    FROM health, activity
+"""
+
+
+_TABLE_DESCRIPTIONS = {
+    "daily_health_metrics": "Daily health summaries including steps, sleep, heart rate, stress, and other key metrics",
+    "timeseries": "High-frequency data like heart rate readings throughout the day, stress levels, body battery",
+    "activities": "Individual workouts and physical activities with performance metrics",
+    "sync_status": "System table tracking data synchronization status (usually not needed for health analysis)"
+}
+
+
+def _quote_ident(name: str) -> str:
+    """Quote an SQLite identifier, doubling any embedded double quotes."""
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+def _is_without_rowid(create_sql: Optional[str]) -> bool:
+    """Check whether a CREATE TABLE statement declares a WITHOUT ROWID table."""
+    # Table options follow the closing parenthesis of the column list
+    table_options = (create_sql or "").rpartition(")")[2]
+    return re.search(r'\bWITHOUT\s+ROWID\b', table_options, re.IGNORECASE) is not None
+
+
 class SQLiteConnection:
     """Secure SQLite connection context manager for read-only access."""
     
-    def __init__(self, db_path: Path):
+    def __init__(self, db_path: Path, mmap_size: int = 0):
         self.db_path = db_path
+        self.mmap_size = mmap_size
         self.conn = None
     
     def __enter__(self):
         """Open read-only SQLite connection."""
         self.conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
-        self.conn.row_factory = sqlite3.Row
+        # Reject writes at the engine level too, and read pages through
+        # memory-mapped I/O instead of read() syscalls
+        self.conn.execute("PRAGMA query_only = ON")
+        if self.mmap_size:
+            self.conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
         return self.conn
     
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -125,7 +189,7 @@ class DatabaseManager:
     
     def get_connection(self):
         """Get read-only database connection."""
-        return SQLiteConnection(self.config.db_path)
+        return SQLiteConnection(self.config.db_path, self.config.mmap_size)
     
     def execute_safe_query(self, query: str, params: Optional[List[Any]] = None) -> List[Dict[str, Any]]:
         """Execute validated query with safety checks."""
@@ -139,24 +203,50 @@ class DatabaseManager:
         
         # Log query if enabled
         if self.config.enable_query_logging:
-            self.logger.info(f"Executing query: {query}")
+            self.logger.info("Executing query: %s", query)
             if params:
-                self.logger.info(f"Parameters: {params}")
+                self.logger.info("Parameters: %s", params)
         
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(query, params or [])
-                results = [dict(row) for row in cursor.fetchall()]
+                # Plain tuples streamed from the cursor and zipped against the
+                # column names, instead of going through sqlite3.Row per row
+                columns = [col[0] for col in cursor.description or ()]
+                # Like sqlite3.Row, keep the first of any duplicate column names
+                first_index: Dict[str, int] = {}
+                for index, name in enumerate(columns):
+                    first_index.setdefault(name, index)
+                
+                if len(first_index) == len(columns):
+                    results = [dict(zip(columns, row)) for row in cursor]
+                else:
+                    indexes = list(first_index.values())
+                    results = [
+                        dict(zip(first_index, [row[index] for index in indexes]))
+                        for row in cursor
+                    ]
                 
                 if self.config.enable_query_logging:
-                    self.logger.info(f"Query returned {len(results)} rows")
+                    self.logger.info("Query returned %d rows", len(results))
                 
                 return results
         except sqlite3.Error as e:
             if self.config.enable_query_logging:
-                self.logger.error(f"Query failed: {str(e)}")
+                self.logger.error("Query failed: %s", e)
             raise ValueError(f"Database error: {str(e)}")
+    
+    def count_rows(self, table_names: List[str]) -> Dict[str, int]:
+        """Count the rows of the given tables in a single query."""
+        if not table_names:
+            return {}
+        
+        count_query = "SELECT " + ", ".join(
+            f'(SELECT COUNT(*) FROM {_quote_ident(name)}) AS {_quote_ident(name)}'
+            for name in table_names
+        )
+        return self.execute_safe_query(count_query)[0]
 
 
 # Initialize MCP server
@@ -195,22 +285,15 @@ def create_mcp_server(config: Optional[MCPConfig] = None) -> FastMCP:
         """
         try:
             # Get all tables
-            tables_query = """
-                SELECT name FROM sqlite_master 
-                WHERE type='table' 
-                ORDER BY name
-            """
-            tables = db_manager.execute_safe_query(tables_query)
+            tables = db_manager.execute_safe_query(_SQL_LIST_TABLES)
             table_names = [row['name'] for row in tables]
             
-            # Get row counts for each table
+            row_counts = db_manager.count_rows(table_names)
+
             table_info = {}
             for table_name in table_names:
-                count_query = f"SELECT COUNT(*) as count FROM {table_name}"
-                count_result = db_manager.execute_safe_query(count_query)
-                
                 table_info[table_name] = {
-                    "row_count": count_result[0]['count'],
+                    "row_count": row_counts[table_name],
                     "description": _get_table_description(table_name)
                 }
             
@@ -243,19 +326,11 @@ def create_mcp_server(config: Optional[MCPConfig] = None) -> FastMCP:
             raise ValueError("Invalid table name format")
         
         try:
-            # Verify table exists
-            check_query = """
-                SELECT name FROM sqlite_master 
-                WHERE type='table' AND name=?
-            """
-            check_result = db_manager.execute_safe_query(check_query, [table_name])
+            # Verify table exists; the same listing feeds the error message
+            table_sql = {row['name']: row['sql'] for row in db_manager.execute_safe_query(_SQL_TABLE_DEFINITIONS)}
             
-            if not check_result:
-                available_tables = db_manager.execute_safe_query(
-                    "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
-                )
-                table_list = [row['name'] for row in available_tables]
-                raise ValueError(f"Table '{table_name}' does not exist. Available tables: {', '.join(table_list)}")
+            if table_name not in table_sql:
+                raise ValueError(f"Table '{table_name}' does not exist. Available tables: {', '.join(table_sql)}")
             
             # Get table schema using PRAGMA
             schema_query = f"PRAGMA table_info({table_name})"
@@ -271,8 +346,13 @@ def create_mcp_server(config: Optional[MCPConfig] = None) -> FastMCP:
                 'is_primary_key': bool(col[5])
             } for col in columns]
             
-            # Get sample data (latest 3 records)
-            sample_query = f"SELECT * FROM {table_name} ORDER BY rowid DESC LIMIT 3"
+            # Get sample data (latest 3 records). WITHOUT ROWID tables have no
+            # rowid, so those are ordered by their primary key instead.
+            order_by = "rowid DESC"
+            if _is_without_rowid(table_sql[table_name]):
+                primary_key = sorted((col[5], col[1]) for col in columns if col[5])
+                order_by = ", ".join(f'{_quote_ident(name)} DESC' for _, name in primary_key)
+            sample_query = f"SELECT * FROM {table_name} ORDER BY {order_by} LIMIT 3"
             sample_data = db_manager.execute_safe_query(sample_query)
             
             return {
@@ -343,36 +423,10 @@ def create_mcp_server(config: Optional[MCPConfig] = None) -> FastMCP:
             raise ValueError("User ID must be positive")
         
         try:
-            # Get health metrics summary
-            summary_query = """
-                SELECT 
-                    COUNT(*) as total_days_with_data,
-                    ROUND(AVG(total_steps), 0) as avg_daily_steps,
-                    ROUND(AVG(sleep_duration_hours), 1) as avg_sleep_hours,
-                    ROUND(AVG(resting_heart_rate), 0) as avg_resting_hr,
-                    ROUND(AVG(avg_stress_level), 0) as avg_stress_level,
-                    MIN(metric_date) as earliest_data_date,
-                    MAX(metric_date) as latest_data_date
-                FROM daily_health_metrics 
-                WHERE user_id = ? 
-                AND metric_date >= date('now', '-' || ? || ' days')
-            """
-            
-            summary_result = db_manager.execute_safe_query(summary_query, [user_id, days])
+            # Health averages and activity count in a single round-trip
+            summary_result = db_manager.execute_safe_query(_SQL_HEALTH_SUMMARY, [user_id, days])
             summary = summary_result[0] if summary_result else {}
             
-            # Get activity count
-            activity_query = """
-                SELECT COUNT(*) as activity_count
-                FROM activities 
-                WHERE user_id = ? 
-                AND activity_date >= date('now', '-' || ? || ' days')
-            """
-            
-            activity_result = db_manager.execute_safe_query(activity_query, [user_id, days])
-            if activity_result:
-                summary['total_activities'] = activity_result[0]['activity_count']
-            
             summary['analysis_period_days'] = days
             summary['user_id'] = user_id
             
@@ -395,13 +449,7 @@ def create_mcp_server(config: Optional[MCPConfig] = None) -> FastMCP:
 
 def _get_table_description(table_name: str) -> str:
     """Get human-readable description for table."""
-    descriptions = {
-        "daily_health_metrics": "Daily health summaries including steps, sleep, heart rate, stress, and other key metrics",
-        "timeseries": "High-frequency data like heart rate readings throughout the day, stress levels, body battery",
-        "activities": "Individual workouts and physical activities with performance metrics",
-        "sync_status": "System table tracking data synchronization status (usually not needed for health analysis)"
-    }
-    return descriptions.get(table_name, "Health data table")
+    return _TABLE_DESCRIPTIONS.get(table_name, "Health data table")
 
 
 def _get_health_data_guide() -> str:
@@ -11,6 +11,7 @@ from datetime import datetime
 from typing import Any, Optional
 
 from ..core.base import MetricConfig
+from ..core.utils import dataclass_field_names, timestamp_field_names
 
 
 @dataclass
@@ -177,15 +178,13 @@ def parse_training_readiness_data(data: Any) -> TrainingReadiness:
         )
 
     # Filter to known fields only
-    known_fields = {f.name for f in TrainingReadiness.__dataclass_fields__.values()}
+    known_fields = dataclass_field_names(TrainingReadiness)
     filtered_kwargs = {k: v for k, v in snake_dict.items() if k in known_fields}
 
     # Handle common datetime fields
-    for field in ("timestamp", "timestamp_local"):
+    for field in timestamp_field_names(TrainingReadiness):
         if field in filtered_kwargs and isinstance(filtered_kwargs[field], str):
             try:
-                from datetime import datetime
-
                 filtered_kwargs[field] = datetime.fromisoformat(
                     filtered_kwargs[field].replace("Z", "+00:00")
                 )
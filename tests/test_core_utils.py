@@ -24,9 +24,11 @@ from garmy.core.utils import (
     create_simple_field_parser,
     create_simple_parser,
     create_summary_raw_parser,
+    dataclass_field_names,
     date_range,
     format_date,
     handle_api_exception,
+    timestamp_field_names,
 )
 
 
@@ -507,6 +509,36 @@ class TestTimestampMixin:
         assert isinstance(test_obj.datetime, datetime)
 
 
+class TestDataclassFieldNames:
+    """Test cases for dataclass_field_names function."""
+
+    def test_dataclass_field_names_basic(self):
+        """Test dataclass_field_names returns all field names."""
+        assert dataclass_field_names(SampleSummary) == frozenset(
+            {"total", "average", "count"}
+        )
+
+    def test_dataclass_field_names_cached(self):
+        """Test dataclass_field_names returns the same object for repeat calls."""
+        first = dataclass_field_names(SampleMetric)
+        second = dataclass_field_names(SampleMetric)
+
+        assert first is second
+        assert "timestamp_local" in first
+
+
+class TestTimestampFieldNames:
+    """Test cases for timestamp_field_names function."""
+
+    def test_timestamp_field_names_present(self):
+        """Test timestamp_field_names returns the declared timestamp fields."""
+        assert timestamp_field_names(SampleMetric) == ("timestamp", "timestamp_local")
+
+    def test_timestamp_field_names_absent(self):
+        """Test timestamp_field_names is empty for classes without timestamps."""
+        assert timestamp_field_names(SampleSummary) == ()
+
+
 class TestParserFactories:
     """Test cases for parser factory functions."""
 
@@ -0,0 +1,141 @@
+"""Tests for garmy.localdb storage and sync helpers.
+
+The localdb extra (SQLAlchemy) is optional, so these tests are skipped
+when it is not installed.
+"""
+
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from garmy.localdb.db import HealthDB  # noqa: E402
+from garmy.localdb.models import MetricType  # noqa: E402
+from garmy.localdb.sync import SyncManager  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Create a file-backed HealthDB."""
+    health_db = HealthDB(tmp_path / "health.db")
+    yield health_db
+    health_db.engine.dispose()
+
+
+class TestStoreHealthMetricsBatch:
+    """Test cases for HealthDB.store_health_metrics_batch."""
+
+    def test_stores_rows_for_many_dates(self, db):
+        """Test that rows for several dates are stored in one call."""
+        db.store_health_metrics_batch(
+            1,
+            [
+                {"metric_date": date(2024, 1, 1), "total_steps": 1000},
+                {"total_steps": 2000, "metric_date": date(2024, 1, 2)},
+            ],
+        )
+
+        metrics = db.get_health_metrics(1, date(2024, 1, 1), date(2024, 1, 2))
+        assert [m["total_steps"] for m in metrics] == [1000, 2000]
+
+    def test_keeps_columns_not_given(self, db):
+        """Test that an update leaves columns missing from the row untouched."""
+        db.store_health_metrics_batch(
+            1, [{"metric_date": date(2024, 1, 1), "total_steps": 1000}]
+        )
+        db.store_health_metrics_batch(
+            1, [{"metric_date": date(2024, 1, 1), "resting_heart_rate": 50}]
+        )
+
+        (metric,) = db.get_health_metrics(1, date(2024, 1, 1), date(2024, 1, 1))
+        assert metric["total_steps"] == 1000
+        assert metric["resting_heart_rate"] == 50
+
+    def test_refreshes_updated_at(self, db):
+        """Test that updating a row moves updated_at but not created_at."""
+        db.store_health_metrics_batch(
+            1, [{"metric_date": date(2024, 1, 1), "total_steps": 1000}]
+        )
+        (before,) = db.get_health_metrics(1, date(2024, 1, 1), date(2024, 1, 1))
+        db.store_health_metrics_batch(
+            1, [{"metric_date": date(2024, 1, 1), "total_steps": 2000}]
+        )
+        (after,) = db.get_health_metrics(1, date(2024, 1, 1), date(2024, 1, 1))
+
+        assert after["created_at"] == before["created_at"]
+        assert after["updated_at"] > before["updated_at"]
+
+    def test_ignores_unknown_columns(self, db):
+        """Test that names that are not health metric columns are dropped."""
+        db.store_health_metrics_batch(
+            1, [{"metric_date": date(2024, 1, 1), "total_steps": 1000, "bogus": 1}]
+        )
+
+        (metric,) = db.get_health_metrics(1, date(2024, 1, 1), date(2024, 1, 1))
+        assert "bogus" not in metric
+
+
+class TestTimeseries:
+    """Test cases for HealthDB timeseries storage and reads."""
+
+    def test_empty_metadata_reads_as_empty_dict(self, db):
+        """Test that points stored without metadata read back with an empty dict."""
+        db.store_timeseries_batch(
+            1, MetricType.HEART_RATE, [(1000, 60.0, {}), (2000, 61.0, {"source": "wrist"})]
+        )
+
+        assert db.get_timeseries(1, MetricType.HEART_RATE, 0, 3000) == [
+            (1000, 60.0, {}),
+            (2000, 61.0, {"source": "wrist"}),
+        ]
+
+
+class TestExistingActivityIds:
+    """Test cases for HealthDB.get_existing_activity_ids."""
+
+    def test_returns_stored_ids_only(self, db):
+        """Test that only IDs already stored for the user are returned."""
+        db.store_activity(1, {"activity_id": "a1", "activity_date": date(2024, 1, 1)})
+        db.store_activity(2, {"activity_id": "b1", "activity_date": date(2024, 1, 1)})
+
+        assert db.get_existing_activity_ids(1, ["a1", "b1", "c1"]) == {"a1"}
+
+    def test_ignores_activity_date(self, db):
+        """Test that stored activities are found whatever date they have."""
+        db.store_activity(1, {"activity_id": "a1", "activity_date": date(2023, 6, 1)})
+
+        assert db.get_existing_activity_ids(1, ["a1"]) == {"a1"}
+
+    def test_empty_ids(self, db):
+        """Test that no IDs yields an empty set."""
+        assert db.get_existing_activity_ids(1, []) == set()
+
+
+class TestSyncActivities:
+    """Test cases for activity sync existence checks."""
+
+    def test_activity_stored_outside_sync_range_is_skipped(self, tmp_path):
+        """Test that an activity already stored under another date is not stored again."""
+        manager = SyncManager(db_path=tmp_path / "health.db")
+        manager.db.store_activity(
+            1, {"activity_id": "101", "activity_date": date(2023, 12, 31)}
+        )
+        manager.activities_iterator = SimpleNamespace(
+            get_activities_for_date=lambda sync_date: [
+                {"activityId": 101, "activityName": "run"},
+                {"activityId": 102, "activityName": "bike"},
+            ]
+        )
+        stats = {"completed": 0, "skipped": 0, "failed": 0}
+
+        manager._sync_activities_for_date(1, date(2024, 1, 1), stats)
+
+        assert stats == {"completed": 1, "skipped": 1, "failed": 0}
+        activities = manager.db.get_activities(1, date(2023, 12, 1), date(2024, 1, 31))
+        assert {(a["activity_id"], a["activity_date"]) for a in activities} == {
+            ("101", date(2023, 12, 31)),
+            ("102", date(2024, 1, 1)),
+        }
+        manager.db.engine.dispose()
@@ -0,0 +1,100 @@
+"""Tests for garmy.mcp.server query execution.
+
+The mcp extra (FastMCP) is optional, so these tests are skipped when it
+is not installed.
+"""
+
+import sqlite3
+
+import pytest
+
+pytest.importorskip("fastmcp")
+
+from garmy.mcp.config import MCPConfig  # noqa: E402
+from garmy.mcp.server import DatabaseManager, _is_without_rowid  # noqa: E402
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """Create a DatabaseManager over a small health database."""
+    db_path = tmp_path / "health.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE daily_health_metrics (user_id INTEGER, metric_date TEXT)")
+    conn.execute("CREATE TABLE activities (user_id INTEGER, activity_date TEXT)")
+    conn.execute("INSERT INTO daily_health_metrics VALUES (1, '2024-01-01')")
+    conn.execute("INSERT INTO activities VALUES (1, '2024-01-02')")
+    conn.commit()
+    conn.close()
+    return DatabaseManager(MCPConfig.from_db_path(db_path))
+
+
+class TestExecuteSafeQuery:
+    """Test cases for DatabaseManager.execute_safe_query."""
+
+    def test_rows_as_dicts(self, db_manager):
+        """Test that rows are returned as dicts keyed by column name."""
+        result = db_manager.execute_safe_query(
+            "SELECT user_id, metric_date FROM daily_health_metrics"
+        )
+
+        assert result == [{"user_id": 1, "metric_date": "2024-01-01"}]
+
+    def test_duplicate_columns_keep_first(self, db_manager):
+        """Test that duplicate column names keep the first value, like sqlite3.Row."""
+        result = db_manager.execute_safe_query(
+            "SELECT h.user_id, h.metric_date, a.user_id, a.activity_date AS metric_date "
+            "FROM daily_health_metrics h JOIN activities a ON a.user_id = h.user_id"
+        )
+
+        assert result == [{"user_id": 1, "metric_date": "2024-01-01"}]
+        assert list(result[0]) == ["user_id", "metric_date"]
+
+
+class TestCountRows:
+    """Test cases for DatabaseManager.count_rows."""
+
+    def test_counts_each_table(self, db_manager):
+        """Test that every requested table gets its row count."""
+        assert db_manager.count_rows(["activities", "daily_health_metrics"]) == {
+            "activities": 1,
+            "daily_health_metrics": 1,
+        }
+
+    def test_quotes_table_names(self, db_manager, tmp_path):
+        """Test that table names containing double quotes are escaped."""
+        conn = sqlite3.connect(tmp_path / "health.db")
+        conn.execute('CREATE TABLE "odd""name" (x INTEGER)')
+        conn.commit()
+        conn.close()
+
+        assert db_manager.count_rows(['odd"name']) == {'odd"name': 0}
+
+    def test_no_tables(self, db_manager):
+        """Test that no table names means no query and an empty result."""
+        assert db_manager.count_rows([]) == {}
+
+
+class TestIsWithoutRowid:
+    """Test cases for _is_without_rowid."""
+
+    def test_without_rowid_table(self):
+        """Test that a WITHOUT ROWID table option is detected."""
+        assert _is_without_rowid(
+            "CREATE TABLE timeseries (user_id INTEGER, PRIMARY KEY (user_id)) WITHOUT ROWID"
+        )
+
+    def test_rowid_table(self):
+        """Test that ordinary tables are not reported as WITHOUT ROWID."""
+        assert not _is_without_rowid(
+            "CREATE TABLE activities (activity_id TEXT, PRIMARY KEY (activity_id))"
+        )
+
+    def test_column_text_is_ignored(self):
+        """Test that the phrase inside the column list is not mistaken for the option."""
+        assert not _is_without_rowid(
+            "CREATE TABLE notes (body TEXT DEFAULT 'without rowid')"
+        )
+
+    def test_missing_sql(self):
+        """Test that tables without a stored definition count as rowid tables."""
+        assert not _is_without_rowid(None)